@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from .config import settings
+
+
+def _path(digest: str) -> Path:
+    return settings.archive_path / digest[:2] / f"{digest}.xml.gz"
+
+
+def store(payload: bytes) -> str:
+    """Save a fetched feed payload gzip-compressed under its sha256; return the digest.
+
+    Identical payloads (an unchanged feed fetched again) are stored once.
+    """
+    digest = hashlib.sha256(payload).hexdigest()
+    path = _path(digest)
+    if path.exists():
+        return digest
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(payload, compresslevel=6))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return digest
+
+
+def load(digest: str) -> bytes | None:
+    path = _path(digest)
+    if not path.exists():
+        return None
+    return gzip.decompress(path.read_bytes())
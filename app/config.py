@@ -2,9 +2,26 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
+
+def _load_dotenv() -> None:
+    """Load the nearest .env (searching upwards like python-dotenv does).
+
+    python-dotenv is only imported when a .env file actually exists, so
+    containers configured purely through the environment skip it entirely.
+    """
+    here = Path(__file__).resolve().parent
+    for d in (here, *here.parents):
+        candidate = d / ".env"
+        if candidate.is_file():
+            from dotenv import load_dotenv
+
+            load_dotenv(dotenv_path=candidate, override=False)
+            return
+
+
+_load_dotenv()
 
 
 def _env(name: str, default: str = "") -> str:
@@ -21,6 +38,14 @@ class Settings:
     timezone: str = _env("TIMEZONE", "Europe/Vienna")
 
     db_path: str = _env("DB_PATH", "/data/mss.sqlite")
+    # Compressed raw feed payloads (app.archive); defaults to <db dir>/archive
+    archive_dir: str = _env("ARCHIVE_DIR", "")
+
+    # Ingest coordination across processes (see app.lease)
+    ingest_workers: int = int(_env("INGEST_WORKERS", "1"))
+    ingest_cooldown_minutes: int = int(_env("INGEST_COOLDOWN_MINUTES", "0"))
+    # Feeds are read up to this many bytes (app.ingest.fetch_feed)
+    feed_max_bytes: int = int(_env("FEED_MAX_BYTES", str(2 * 1024 * 1024)))
 
     openai_api_key: str = _env("OPENAI_API_KEY", "")
 
@@ -35,6 +60,10 @@ class Settings:
     newsletter_hour: int = int(_env("NEWSLETTER_HOUR", "09"))
     newsletter_minute: int = int(_env("NEWSLETTER_MINUTE", "00"))
 
+    @property
+    def archive_path(self) -> Path:
+        return Path(self.archive_dir) if self.archive_dir else Path(self.db_path).parent / "archive"
+
     @property
     def regions(self) -> list[str]:
         return [r.strip() for r in self.regions_csv.split(",") if r.strip()]
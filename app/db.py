@@ -1,7 +1,20 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import starmap
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import create_engine as sa_create_engine, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import Select
 from sqlmodel import SQLModel, create_engine, Session
 from .config import settings
+from .models import Item, ItemRow, RelatedItem
+from . import search
 
 engine = create_engine(
     f"sqlite:///{settings.db_path}",
@@ -9,9 +22,104 @@ engine = create_engine(
 )
 
 
+# create_all() does not alter existing tables; columns added to Item after
+# the first release are listed here and added on startup.
+_ITEM_COLUMNS = {
+    "search_key": "VARCHAR NOT NULL DEFAULT ''",
+    "tagger_version": "VARCHAR NOT NULL DEFAULT ''",
+    "raw_digest": "VARCHAR NOT NULL DEFAULT ''",
+    "content_hash": "VARCHAR NOT NULL DEFAULT ''",
+    "updated_at": "DATETIME",
+}
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _migrate(conn) -> None:
+    existing = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(item)")}
+    for name, ddl in _ITEM_COLUMNS.items():
+        if name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE item ADD COLUMN {name} {ddl}")
+    if "updated_at" not in existing:
+        conn.exec_driver_sql("UPDATE item SET updated_at = fetched_at")
+    # ... and indexes declared on Item after its table was created.
+    for index in Item.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
 def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+    # Once per process; ingest threads call this concurrently.
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        # WAL lets read_snapshot() readers and the ingest writer run side by
+        # side; the mode is stored in the file, so this is a one-time switch.
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            _migrate(conn)
+            search.install(conn)
+        _initialized = True
 
 
 def get_session() -> Session:
     return Session(engine)
+
+
+@contextmanager
+def read_snapshot() -> Iterator[Connection]:
+    """Read-only connection that sees one consistent state of the DB.
+
+    Everything read through it comes from a single read transaction, so a
+    concurrent ingest is neither waited for nor blocked (the DB is in WAL
+    mode) and half-written ingest rounds are never visible. Nothing here
+    writes: run init_db() first so an older DB gets migrated (and WAL).
+    """
+    path = Path(settings.db_path).resolve()
+    if not path.is_file():
+        raise FileNotFoundError(f"No database at {path}")
+    uri = f"{path.as_uri()}?mode=ro"
+    ro = sa_create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+        poolclass=NullPool,
+    )
+    try:
+        with ro.connect() as conn:
+            # pysqlite leaves SELECTs in autocommit (one snapshot per
+            # statement); an explicit BEGIN pins one for the whole block.
+            conn.exec_driver_sql("BEGIN")
+            yield conn
+    finally:
+        ro.dispose()
+
+
+def _connect(conn: Connection | None):
+    return nullcontext(conn) if conn is not None else engine.connect()
+
+
+def fetch_item_rows(stmt: Select, conn: Connection | None = None) -> list[ItemRow]:
+    """Run a ``select(*ITEM_ROW_COLUMNS)`` statement and return ItemRows."""
+    with _connect(conn) as conn:
+        return list(starmap(ItemRow, conn.execute(stmt)))
+
+
+def fetch_related(item_ids: Iterable[int], limit: int = 3, conn: Connection | None = None) -> dict[int, list[dict]]:
+    """{item id: [{"title", "url", "source"}, ...]} from app.related's lists, best first."""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return {}
+    stmt = (
+        select(RelatedItem.item_id, Item.title, Item.url, Item.source)
+        .join(Item, Item.id == RelatedItem.related_id)
+        .where(RelatedItem.item_id.in_(item_ids), RelatedItem.rank < limit)
+        .order_by(RelatedItem.item_id, RelatedItem.rank)
+    )
+    out: dict[int, list[dict]] = {}
+    with _connect(conn) as conn:
+        for item_id, title, url, source in conn.execute(stmt):
+            out.setdefault(item_id, []).append({"title": title, "url": url, "source": source})
+    return out
@@ -0,0 +1,148 @@
+"""
+Personalized weekly digests.
+
+Subscribers choose a region, item type and topic ("All" means no filter).
+``build_digests`` renders one feed per *distinct* combination from a single
+query partitioned in memory, so the cost follows the number of combinations
+rather than the number of subscribers.
+
+Run:
+  python -m app.digest --out digests subscribers.jsonl
+
+where each line of the input holds ``region``/``item_type``/``topic`` keys
+(missing keys mean "All"). Writes ``<key>.xml`` per combination plus an
+``index.json`` with the preferences and subscriber count of each key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import Select, select
+
+from .config import settings
+from .db import fetch_item_rows, init_db
+from .feed import build_rss
+from .models import ITEM_ROW_COLUMNS, Item, ItemRow
+
+DIGEST_DAYS = 7
+DIGEST_ITEMS = 50
+
+
+@dataclass(frozen=True)
+class DigestPrefs:
+    region: str = "All"
+    item_type: str = "All"
+    topic: str = "All"
+
+    @classmethod
+    def from_dict(cls, d: dict) -> DigestPrefs:
+        return cls(
+            region=d.get("region") or "All",
+            item_type=d.get("item_type") or "All",
+            topic=d.get("topic") or "All",
+        )
+
+    @property
+    def key(self) -> str:
+        """Stable file-name-safe id, e.g. ``europe--funding--all``."""
+        parts = (self.region, self.item_type, self.topic)
+        return "--".join(re.sub(r"[^a-z0-9]+", "-", p.lower()).strip("-") for p in parts)
+
+    def matches(self, it: ItemRow) -> bool:
+        return (
+            (self.region == "All" or it.region == self.region)
+            and (self.item_type == "All" or it.item_type == self.item_type)
+            and (self.topic == "All" or it.topic == self.topic)
+        )
+
+
+def digest_stmt(prefs: DigestPrefs, days: int = DIGEST_DAYS, sort: str = "published") -> Select:
+    """Items of the last ``days`` matching ``prefs``.
+
+    ``sort="updated"`` windows and orders by ``updated_at`` instead, so
+    corrected or extended calls resurface in the digest.
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    if sort == "updated":
+        stmt = select(*ITEM_ROW_COLUMNS).where(Item.updated_at >= since).order_by(Item.updated_at.desc())
+    else:
+        stmt = select(*ITEM_ROW_COLUMNS).where((Item.published == None) | (Item.published >= since)).order_by(
+            Item.published.desc().nullslast(), Item.fetched_at.desc()
+        )
+    if prefs.region != "All":
+        stmt = stmt.where(Item.region == prefs.region)
+    if prefs.item_type != "All":
+        stmt = stmt.where(Item.item_type == prefs.item_type)
+    if prefs.topic != "All":
+        stmt = stmt.where(Item.topic == prefs.topic)
+    return stmt
+
+
+def render_digest(prefs: DigestPrefs, items: Iterable[ItemRow], self_path: str | None = None) -> str:
+    labels = [p for p in (prefs.region, prefs.item_type, prefs.topic) if p != "All"]
+    return build_rss(
+        title=f"{settings.site_name} – Weekly Digest" + (f" ({', '.join(labels)})" if labels else ""),
+        link=settings.public_base_url,
+        description="Automatically curated academic opportunities and business research items.",
+        items=items,
+        self_path=self_path or f"/feeds/digests/{prefs.key}.xml",
+    )
+
+
+def build_digests(
+    prefs: Iterable[DigestPrefs],
+    out_dir: Path | None = None,
+    days: int = DIGEST_DAYS,
+    limit: int = DIGEST_ITEMS,
+) -> dict[DigestPrefs, str]:
+    """Render one digest per distinct preference combination.
+
+    Returns ``{prefs: rss}``; with ``out_dir`` each feed is also written to
+    ``out_dir/<prefs.key>.xml``.
+    """
+    distinct = set(prefs)
+    rows = fetch_item_rows(digest_stmt(DigestPrefs(), days=days))
+
+    feeds = {}
+    for p in distinct:
+        feeds[p] = render_digest(p, islice((r for r in rows if p.matches(r)), limit))
+
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for p, rss in feeds.items():
+            (out_dir / f"{p.key}.xml").write_text(rss, encoding="utf-8")
+    return feeds
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build personalized digest feeds.")
+    ap.add_argument("subscribers", type=Path, help="JSON lines with region/item_type/topic per subscriber")
+    ap.add_argument("--out", type=Path, required=True)
+    ap.add_argument("--days", type=int, default=DIGEST_DAYS)
+    ap.add_argument("--limit", type=int, default=DIGEST_ITEMS)
+    args = ap.parse_args()
+
+    init_db()
+    counts: Counter[DigestPrefs] = Counter()
+    with args.subscribers.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                counts[DigestPrefs.from_dict(json.loads(line))] += 1
+
+    build_digests(counts, out_dir=args.out, days=args.days, limit=args.limit)
+    index = {p.key: {**asdict(p), "subscribers": n} for p, n in counts.items()}
+    (args.out / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Wrote {len(counts)} digests for {sum(counts.values())} subscribers to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Iterable
 from xml.sax.saxutils import escape
 
-from .models import Item
+from .models import ItemRow
 
 
 def _fmt(dt: datetime | None) -> str:
@@ -13,9 +13,15 @@ def _fmt(dt: datetime | None) -> str:
     return dt.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
 
-def build_rss(title: str, link: str, description: str, items: Iterable[Item]) -> str:
+def build_rss(
+    title: str,
+    link: str,
+    description: str,
+    items: Iterable[ItemRow],
+    self_path: str = "/feeds/newsletter.xml",
+) -> str:
     now = datetime.utcnow()
-    self_link = link.rstrip("/") + "/feeds/newsletter.xml"
+    self_link = link.rstrip("/") + self_path
     parts = []
     parts.append('<?xml version="1.0" encoding="UTF-8"?>')
     parts.append('<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">')
@@ -1,22 +1,42 @@
 from __future__ import annotations
 
 import hashlib
-from datetime import datetime
+import heapq
+import re
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterable, Tuple
 
 import feedparser
+import requests
 import yaml
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import select
 
+from . import archive
 from .config import settings
 from .db import get_session, init_db
+from .lease import LeaseKeeper
 from .models import Item
-from .tagging import infer_tags
+from .search import index_terms, search_key
+from .tagging import TAGGER_VERSION, infer_tags
 from .ai import summarize_with_openai
 
 SOURCES_FILE = Path(__file__).parent / "sources" / "sources.yaml"
 
+# Batched (executemany) updates of already-ingested entries; the SET clause
+# comes from the keys of the parameter dicts.
+_UPDATE_ITEM = update(Item.__table__).where(Item.__table__.c.id == bindparam("b_id"))
+
+# Inserts of new entries; a fingerprint inserted concurrently by another
+# ingester is left alone, and RETURNING tells which rows were ours.
+_INSERT_NEW_ITEMS = (
+    sqlite_insert(Item.__table__)
+    .on_conflict_do_nothing(index_elements=["fingerprint"])
+    .returning(Item.__table__.c.fingerprint)
+)
+
 
 def _fingerprint(url: str) -> str:
     return hashlib.sha256(url.encode("utf-8")).hexdigest()
@@ -38,37 +58,133 @@ def _parse_date(entry) -> datetime | None:
     return None
 
 
-def iter_feed_items(
-    source_name: str,
-    feed_url: str,
-    fallback_region: str,
-    fallback_type: str,
-) -> Iterable[Tuple[str, str, datetime | None, str, str, str, str]]:
-    feed = feedparser.parse(feed_url)
-    for e in feed.entries or []:
+# Closing tag of an RSS <item> or Atom <entry>, optionally namespaced.
+_ENTRY_END = re.compile(rb"</(?:[\w-]+:)?(?:item|entry)\s*>")
+
+
+def _complete_entries(payload: bytes) -> bytes:
+    """Cut a truncated payload after its last complete entry, so the tail
+    entry is not ingested with a cut-off summary (and a wrong hash)."""
+    last = None
+    for last in _ENTRY_END.finditer(payload):
+        pass
+    return payload[: last.end()] if last else payload
+
+
+def fetch_feed(feed_url: str, max_bytes: int | None = None) -> tuple[bytes, int] | None:
+    """Download a feed's raw payload: (payload, wire bytes), None if the
+    request fails or a local file cannot be read.
+
+    At most ``max_bytes`` (default FEED_MAX_BYTES) of decoded content are
+    read; a longer feed is cut off there, keeping the entries that arrived
+    complete. Feeds list their newest entries first in practice, so those
+    are the ones kept. Wire bytes are what was actually received: before
+    gzip/deflate decoding, and including any read past the cap.
+    """
+    max_bytes = max_bytes or settings.feed_max_bytes
+    if "://" not in feed_url:
+        # local file, as feedparser.parse() would accept
+        try:
+            with open(feed_url, "rb") as f:
+                data = f.read(max_bytes + 1)
+        except OSError:
+            return None
+        wire = len(data)
+    else:
+        try:
+            with requests.get(
+                feed_url,
+                headers={"User-Agent": f"{settings.site_name} (+{settings.public_base_url})"},
+                timeout=30,
+                stream=True,
+            ) as r:
+                r.raise_for_status()
+                chunks: list[bytes] = []
+                size = 0
+                for chunk in r.iter_content(chunk_size=64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > max_bytes:
+                        break
+                wire = r.raw.tell()
+        except requests.RequestException:
+            return None
+        data = b"".join(chunks)
+
+    if len(data) > max_bytes:
+        data = _complete_entries(data[:max_bytes])
+    return data, wire
+
+
+def iter_entries(feed: bytes | str) -> Iterable[Tuple[str, str, datetime | None, str]]:
+    """Yield (title, url, published, summary_text) for usable entries of a feed."""
+    parsed = feedparser.parse(feed)
+    for e in parsed.entries or []:
         title = (getattr(e, "title", "") or "").strip()
         url = (getattr(e, "link", "") or "").strip()
         if not title or not url:
             continue
+        yield title, url, _parse_date(e), (getattr(e, "summary", "") or "").strip()
 
-        published = _parse_date(e)
-        summary_text = (getattr(e, "summary", "") or "").strip()
 
-        tags = infer_tags(title, summary_text, fallback_region=fallback_region, fallback_type=fallback_type)
+def _content_hash(title: str, published: datetime | None, summary_text: str) -> str:
+    """Hash of the entry fields we derive a row from; changes when the source edits them."""
+    raw = "\x1f".join((title, published.isoformat() if published else "", summary_text))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
-        # optional AI summary (short)
-        ai_sum = summarize_with_openai(title, summary_text) or ""
 
-        yield title, url, published, tags.region, tags.item_type, tags.topic, (ai_sum or summary_text[:280])
+def newest_entries(
+    entries: Iterable[Tuple[str, str, datetime | None, str]], limit: int
+) -> list[Tuple[str, str, datetime | None, str]]:
+    """The ``limit`` newest entries, one per URL; undated entries rank last
+    and ties keep feed order."""
+    unique: dict[str, Tuple[str, str, datetime | None, str]] = {}
+    for entry in entries:
+        unique.setdefault(entry[1], entry)
+    return heapq.nlargest(limit, unique.values(), key=lambda e: e[2] or datetime.min)
+
+
+def enrich_entry(
+    title: str,
+    summary_text: str,
+    fallback_region: str,
+    fallback_type: str,
+) -> Tuple[str, str, str, str]:
+    """Tag and summarize one entry: (region, item_type, topic, summary)."""
+    tags = infer_tags(title, summary_text, fallback_region=fallback_region, fallback_type=fallback_type)
 
+    # optional AI summary (short)
+    ai_sum = summarize_with_openai(title, summary_text) or ""
 
-def ingest_once(limit_per_source: int = 40) -> dict:
+    return tags.region, tags.item_type, tags.topic, (ai_sum or summary_text[:280])
+
+
+def ingest_once(limit_per_source: int = 40, done: set[str] | None = None) -> dict:
+    """Ingest every source not currently leased by another process.
+
+    Each source is claimed through a DB lease before it is fetched, so the web
+    process, generate_site.py and any number of workers can call this at once:
+    each source is ingested by one of them at a time. Calls sharing a
+    ``done`` set (the worker's threads in one round) also skip sources one
+    of them has already finished. Optionally a finished source stays claimed
+    for ``INGEST_COOLDOWN_MINUTES`` (default 0), e.g. for several worker
+    processes on a shared schedule.
+
+    ``per_source`` in the result has, for each ingested source, the bytes
+    received over the wire, the entries parsed from them, how many of those were
+    considered (the newest ``limit_per_source``) and how many were new or
+    edited and therefore tagged/summarized.
+    """
     init_db()
     sources = load_sources()
     inserted = 0
+    updated = 0
     skipped = 0
+    busy = 0
+    stats: dict[str, dict] = {}
+    cooldown = timedelta(minutes=settings.ingest_cooldown_minutes)
 
-    with get_session() as session:
+    with LeaseKeeper() as leases, get_session() as session:
         for s in sources:
             name = s.get("name", "Unknown")
             url = s.get("url", "")
@@ -77,32 +193,120 @@ def ingest_once(limit_per_source: int = 40) -> dict:
             fallback_region = s.get("default_region", "Global")
             fallback_type = s.get("default_type", "other")
 
-            count = 0
-            for title, link, published, region, item_type, topic, summary in iter_feed_items(name, url, fallback_region, fallback_type):
-                count += 1
-                if count > limit_per_source:
-                    break
-
-                fp = _fingerprint(link)
-                existing = session.exec(select(Item).where(Item.fingerprint == fp)).first()
-                if existing is not None:
-                    skipped += 1
+            lease_name = f"ingest:{url}"
+            if not leases.acquire(lease_name):
+                busy += 1
+                continue
+            if done is not None:
+                if url in done:
+                    leases.release(lease_name)
+                    busy += 1
                     continue
+                done.add(url)
+
+            fetched = fetch_feed(url)
+            if fetched is None:
+                leases.release(lease_name)
+                continue
+            payload, wire_bytes = fetched
+
+            try:
+                # Rows are written only at the end so no write transaction stays
+                # open (blocking other processes' leases) during fetch/summarize.
+                # The limit applies before any tagging/summarizing: only the
+                # newest ``limit_per_source`` entries go further.
+                parsed = list(iter_entries(payload))
+                entries = {_fingerprint(e[1]): e for e in newest_entries(parsed, limit_per_source)}
+                stats[name] = {"wire_bytes": wire_bytes, "entries": len(parsed), "processed": len(entries)}
+
+                # One indexed lookup for the whole batch; entries whose hash is
+                # unchanged stop here without being tagged or summarized.
+                known = {
+                    fp: (item_id, item_source, content_hash)
+                    for fp, item_id, item_source, content_hash in session.exec(
+                        select(Item.fingerprint, Item.id, Item.source, Item.content_hash).where(
+                            Item.fingerprint.in_(list(entries))
+                        )
+                    )
+                }
+
+                now = datetime.utcnow()
+                new_items: list[dict] = []
+                changed: list[dict] = []
+                hash_backfill: list[dict] = []
+                for fp, (title, link, published, summary_text) in entries.items():
+                    content_hash = _content_hash(title, published, summary_text)
+                    item_id, item_source, known_hash = known.get(fp, (None, None, None))
+                    if item_id is not None and item_source != name:
+                        # Same link listed by another source (e.g. Grants.gov's
+                        # "New" and "Modified" feeds): the row stays with the
+                        # source that ingested it first.
+                        skipped += 1
+                        continue
+                    if known_hash == content_hash:
+                        skipped += 1
+                        continue
+                    if known_hash == "":
+                        # Row predates content hashes: record it, don't treat as edited.
+                        hash_backfill.append({"b_id": item_id, "content_hash": content_hash})
+                        skipped += 1
+                        continue
+
+                    region, item_type, topic, summary = enrich_entry(title, summary_text, fallback_region, fallback_type)
+                    fields = dict(
+                        title=title,
+                        url=link,
+                        source=name,
+                        published=published,
+                        region=region,
+                        item_type=item_type,
+                        topic=topic,
+                        summary=summary,
+                        search_key=search_key(title, summary, topic, name),
+                        tagger_version=TAGGER_VERSION,
+                        content_hash=content_hash,
+                    )
+                    if item_id is None:
+                        new_items.append({"fingerprint": fp, "fetched_at": now, "updated_at": now, **fields})
+                    else:
+                        changed.append({"b_id": item_id, "updated_at": now, **fields})
+
+                # Archive the payload only if a row will point at it: feeds that
+                # restamp <lastBuildDate> differ on every fetch and would
+                # otherwise leave one unreferenced file per round.
+                if new_items or changed:
+                    digest = archive.store(payload)
+                    for row in (*new_items, *changed):
+                        row["raw_digest"] = digest
+
+                conn = session.connection()
+                added: set[str] = set()
+                if new_items:
+                    # Another ingester (another source listing the same link)
+                    # may have inserted it since the lookup above; it keeps it.
+                    added = {r[0] for r in conn.execute(_INSERT_NEW_ITEMS, new_items)}
+                    skipped += len(new_items) - len(added)
+                    new_items = [it for it in new_items if it["fingerprint"] in added]
+                if changed:
+                    conn.execute(_UPDATE_ITEM, changed)
+                if hash_backfill:
+                    conn.execute(_UPDATE_ITEM, hash_backfill)
+                index_terms(conn, [it["search_key"] for it in new_items] + [c["search_key"] for c in changed])
+                session.commit()
+                inserted += len(new_items)
+                updated += len(changed)
+                stats[name]["enriched"] = len(new_items) + len(changed)
+            except BaseException:
+                session.rollback()
+                leases.release(lease_name)
+                raise
+            leases.release(lease_name, hold=cooldown)
 
-                item = Item(
-                    title=title,
-                    url=link,
-                    source=name,
-                    published=published,
-                    region=region,
-                    item_type=item_type,
-                    topic=topic,
-                    summary=summary,
-                    fingerprint=fp,
-                )
-                session.add(item)
-                inserted += 1
-
-        session.commit()
-
-    return {"inserted": inserted, "skipped": skipped, "sources": len(sources)}
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": skipped,
+        "busy": busy,
+        "sources": len(sources),
+        "per_source": stats,
+    }
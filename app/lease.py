@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.sqlite import insert
+
+from .db import engine
+from .models import Lease
+
+LEASE_TTL = timedelta(seconds=120)
+
+
+def new_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire(name: str, owner: str, ttl: timedelta = LEASE_TTL) -> bool:
+    """Take the lease if it is free, expired, or already ours."""
+    now = datetime.utcnow()
+    values = {"owner": owner, "acquired_at": now, "heartbeat_at": now, "expires_at": now + ttl}
+    with engine.begin() as conn:
+        res = conn.execute(
+            update(Lease)
+            .where(Lease.name == name, or_(Lease.expires_at < now, Lease.owner == owner))
+            .values(**values)
+        )
+        if res.rowcount:
+            return True
+        res = conn.execute(
+            insert(Lease).values(name=name, **values).on_conflict_do_nothing(index_elements=["name"])
+        )
+        return res.rowcount == 1
+
+
+def renew(names: list[str], owner: str, ttl: timedelta = LEASE_TTL) -> int:
+    if not names:
+        return 0
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        res = conn.execute(
+            update(Lease)
+            .where(Lease.name.in_(names), Lease.owner == owner)
+            .values(heartbeat_at=now, expires_at=now + ttl)
+        )
+        return res.rowcount
+
+
+def release(name: str, owner: str, hold: timedelta = timedelta(0)) -> None:
+    """Give up the lease; with ``hold`` it stays blocked for others that long."""
+    with engine.begin() as conn:
+        conn.execute(
+            update(Lease)
+            .where(Lease.name == name, Lease.owner == owner)
+            .values(expires_at=datetime.utcnow() + hold)
+        )
+
+
+class LeaseKeeper:
+    """Holds leases for one owner and heartbeats them from a background thread.
+
+    Leases that are not released explicitly are released on exit, so a crash
+    inside the ``with`` block frees them immediately; a killed process frees
+    them once ``ttl`` passes without a heartbeat.
+    """
+
+    def __init__(self, owner: str | None = None, ttl: timedelta = LEASE_TTL):
+        self.owner = owner or new_owner()
+        self.ttl = ttl
+        self._held: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def acquire(self, name: str) -> bool:
+        if not try_acquire(name, self.owner, self.ttl):
+            return False
+        with self._lock:
+            self._held.add(name)
+        return True
+
+    def release(self, name: str, hold: timedelta = timedelta(0)) -> None:
+        with self._lock:
+            self._held.discard(name)
+        release(name, self.owner, hold)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.ttl.total_seconds() / 3):
+            with self._lock:
+                names = list(self._held)
+            try:
+                renew(names, self.owner, self.ttl)
+            except Exception:
+                # A missed beat is fine; the next one (or expiry) settles it.
+                pass
+
+    def __enter__(self) -> LeaseKeeper:
+        self._thread = threading.Thread(target=self._heartbeat, name=f"lease-{self.owner}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for name in list(self._held):
+            self.release(name)
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlmodel import select
+from sqlalchemy import false, select, text
 
 from .config import settings
-from .db import init_db, get_session
-from .models import Item
-from .ingest import ingest_once
-from .feed import build_rss
-from .mailerlite import get_or_create_group, upsert_subscriber
+from .db import engine, init_db, fetch_item_rows, fetch_related
+from .models import Item, ITEM_ROW_COLUMNS
+from .search import match_expression
+from .digest import DIGEST_ITEMS, DigestPrefs, digest_stmt, render_digest
+
+# Heavy, rarely-used dependencies (feedparser/yaml via .ingest, numpy/scipy via
+# .related, requests via .mailerlite) are imported inside the handlers that
+# need them so the web process starts without paying for them.
 
 app = FastAPI(title=settings.site_name)
 templates = Jinja2Templates(directory=str((__import__("pathlib").Path(__file__).parent / "templates").resolve()))
@@ -32,60 +35,65 @@ def health() -> dict:
 @app.get("/admin/ingest")
 def admin_ingest() -> dict:
     # convenience endpoint for you; protect later if you want
-    return ingest_once(limit_per_source=40)
+    from .ingest import ingest_once
+    from .related import refresh_after_ingest
+
+    result = ingest_once(limit_per_source=40)
+    result["related"] = refresh_after_ingest(result)
+    return result
 
 
 @app.get("/", response_class=HTMLResponse)
-def index(request: Request, region: str = "All", item_type: str = "All", q: str = ""):
+def index(request: Request, region: str = "All", item_type: str = "All", q: str = "", sort: str = "published"):
     regions = ["All"] + settings.regions
     types = ["All", "funding", "cfp", "conference", "journal", "other"]
 
-    stmt = select(Item).order_by(Item.published.desc().nullslast(), Item.fetched_at.desc())
+    if sort == "updated":
+        stmt = select(*ITEM_ROW_COLUMNS).order_by(Item.updated_at.desc())
+    else:
+        stmt = select(*ITEM_ROW_COLUMNS).order_by(Item.published.desc().nullslast(), Item.fetched_at.desc())
     if region != "All":
         stmt = stmt.where(Item.region == region)
     if item_type != "All":
         stmt = stmt.where(Item.item_type == item_type)
-    if q:
-        like = f"%{q.lower()}%"
-        stmt = stmt.where((Item.title.ilike(like)) | (Item.summary.ilike(like)) | (Item.topic.ilike(like)))
-
-    with get_session() as session:
-        items = session.exec(stmt.limit(120)).all()
+    if q.strip():
+        # Typo/umlaut-tolerant lookup through the FTS index (see app.search).
+        with engine.connect() as conn:
+            expr = match_expression(conn, q)
+        if expr:
+            stmt = stmt.where(
+                text("item.id IN (SELECT rowid FROM item_fts WHERE item_fts MATCH :fts_q)").bindparams(fts_q=expr)
+            )
+        else:
+            # Only punctuation ("??", "-"): no word can match anything.
+            stmt = stmt.where(false())
+
+    items = fetch_item_rows(stmt.limit(120))
+    related = fetch_related(it.id for it in items)
 
     return templates.TemplateResponse(
         "index.html",
         {
             "request": request,
             "items": items,
+            "related": related,
             "regions": regions,
             "types": types,
             "selected_region": region,
             "selected_type": item_type,
             "q": q,
+            "sort": sort,
             "settings": settings,
         },
     )
 
 
 @app.get("/feeds/newsletter.xml")
-def newsletter_feed(region: str = "All"):
+def newsletter_feed(region: str = "All", item_type: str = "All", topic: str = "All", sort: str = "published"):
     # Weekly digest feed (Mailerlite can consume this as an RSS campaign)
-    since = datetime.utcnow() - timedelta(days=7)
-    stmt = select(Item).where((Item.published == None) | (Item.published >= since)).order_by(
-        Item.published.desc().nullslast(), Item.fetched_at.desc()
-    )
-    if region != "All":
-        stmt = stmt.where(Item.region == region)
-
-    with get_session() as session:
-        items = session.exec(stmt.limit(50)).all()
-
-    rss = build_rss(
-        title=f"{settings.site_name} – Weekly Digest" + (f" ({region})" if region != "All" else ""),
-        link=settings.public_base_url,
-        description="Automatically curated academic opportunities and business research items.",
-        items=items,
-    )
+    prefs = DigestPrefs(region=region, item_type=item_type, topic=topic)
+    items = fetch_item_rows(digest_stmt(prefs, sort=sort).limit(DIGEST_ITEMS))
+    rss = render_digest(prefs, items, self_path="/feeds/newsletter.xml")
     return Response(content=rss, media_type="application/rss+xml")
 
 
@@ -104,6 +112,8 @@ def subscribe(
     if region == "All":
         region = "Global"
 
+    from .mailerlite import get_or_create_group, upsert_subscriber
+
     try:
         group_id = get_or_create_group(f"MSS – {region}")
         upsert_subscriber(email=email, group_ids=[group_id], fields={"region": region})
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
@@ -23,6 +24,84 @@ class Item(SQLModel, table=True):
     summary: str = ""
     fingerprint: str = Field(index=True)
 
+    # Folded/stemmed tokens for search (app.search.search_key); FTS-indexed.
+    search_key: str = ""
+
+    # Tagging provenance for `python -m app.reprocess`: which keyword tables
+    # produced the tags, and which archived payload (app.archive) held the entry.
+    tagger_version: str = ""
+    raw_digest: str = ""
+
+    # Hash of the source entry (title/date/text), so re-seen entries are
+    # compared without re-tagging; updated_at moves when it changes.
+    content_hash: str = ""
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
 
 Index("idx_item_fingerprint", Item.fingerprint, unique=True)
 Index("idx_item_region_type", Item.region, Item.item_type)
+Index("idx_item_updated_at", Item.updated_at)
+
+
+class Lease(SQLModel, table=True):
+    """Cross-process lock row; see app.lease."""
+
+    name: str = Field(primary_key=True)
+    owner: str
+    acquired_at: datetime = Field(default_factory=datetime.utcnow)
+    heartbeat_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+
+class RelatedItem(SQLModel, table=True):
+    """Precomputed top-k similar items from other sources; see app.related."""
+
+    __tablename__ = "related_item"
+
+    item_id: int = Field(primary_key=True)
+    rank: int = Field(primary_key=True)
+    # NULL in the single placeholder row of an item without neighbours.
+    related_id: Optional[int] = Field(default=None, index=True)
+    score: float
+    # Item.updated_at the list was computed from; newer means stale.
+    item_updated_at: datetime
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+@dataclass(frozen=True, slots=True)
+class ItemRow:
+    """Read-only view of an Item for listing/feed/export code paths.
+
+    Built straight from column-selected Core queries (see ``db.fetch_item_rows``),
+    so it skips pydantic validation and session identity-map tracking.
+    """
+
+    id: int
+    title: str
+    url: str
+    source: str
+    published: Optional[datetime]
+    fetched_at: datetime
+    region: str
+    item_type: str
+    topic: str
+    summary: str
+    search_key: str
+    updated_at: datetime
+
+
+# Column order must match ItemRow's field order.
+ITEM_ROW_COLUMNS = (
+    Item.id,
+    Item.title,
+    Item.url,
+    Item.source,
+    Item.published,
+    Item.fetched_at,
+    Item.region,
+    Item.item_type,
+    Item.topic,
+    Item.summary,
+    Item.search_key,
+    Item.updated_at,
+)
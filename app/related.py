@@ -0,0 +1,252 @@
+"""
+"Related opportunities": top-k TF-IDF neighbours of each item from other sources.
+
+Documents are the items' search keys (folded, stemmed title/summary/topic
+tokens, see app.search) minus the tokens of the source name. Each run
+rebuilds the sparse TF-IDF matrix (cheap), then recomputes neighbour lists
+only for items that are new/updated since their list was computed, plus
+existing items whose k-th best score a new item now beats. ``full=True``
+recomputes every list, e.g. after the vocabulary has drifted a lot.
+
+Scores are computed in batched sparse products with each querying item
+reduced to its QUERY_TERMS highest-weighted terms, which keeps the cost
+roughly linear in the number of items; the neighbours keep full vectors.
+
+Measured with benchmarks/related.py at 100k items: a full rebuild takes
+about 11 s, an incremental run after 500 new items about 4 s. Only the
+incremental path, which is what the worker and /admin/ingest use, meets
+the "few seconds" target; keep ``--full`` for occasional manual runs.
+
+Run:
+  python -m app.related [--full]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from itertools import count, repeat
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import String, delete, func, select, type_coerce
+from sqlalchemy.engine import Connection
+
+from .db import engine, init_db
+from .lease import LeaseKeeper
+from .models import Item, RelatedItem
+from .search import tokens
+
+RELATED_K = 5
+# Terms in fewer docs cannot link two items; terms in more than this share of
+# docs ("research", "call", ...) add cost but almost no signal.
+MIN_DF = 2
+MAX_DF = 0.2
+QUERY_TERMS = 8
+BATCH = 4096
+# How long a post-ingest refresh waits for one already running elsewhere
+# (a full rebuild at 100k items takes ~11 s), and how often it checks.
+LEASE_WAIT = 60.0
+LEASE_POLL = 1.0
+
+
+def _matrix(rows, src: np.ndarray) -> sparse.csr_matrix:
+    """L2-normalized binary-TF x IDF matrix, one row per item."""
+    # One split of the joined keys; per-row lengths from the separator counts.
+    keys = [r.search_key for r in rows]
+    flat = " ".join(keys).split()
+    vocab = dict(zip(dict.fromkeys(flat), count()))
+    cols = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int32, count=len(flat))
+    lengths = np.fromiter((k.count(" ") + 1 if k else 0 for k in keys), dtype=np.int64, count=len(keys))
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+
+    n = len(rows)
+    df = np.bincount(cols, minlength=len(vocab))
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    idf[(df < MIN_DF) | (df > max(MIN_DF, MAX_DF * n))] = 0
+    data = idf[cols]
+
+    # An item's own source name says nothing about what it is about.
+    source_terms = {}
+    for r, s in zip(rows, src.tolist()):
+        if s not in source_terms:
+            source_terms[s] = [vocab[t] for t in tokens(r.source) if t in vocab]
+    pairs = np.array([s * len(vocab) + t for s, terms in source_terms.items() for t in terms], dtype=np.int64)
+    data[np.isin(np.repeat(src, lengths) * len(vocab) + cols, pairs)] = 0
+
+    x = sparse.csr_matrix((data, cols, indptr), shape=(n, len(vocab)))
+    x.eliminate_zeros()
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).dot(x).tocsr()
+
+
+def _top_per_row(m: sparse.csr_matrix, k: int, keep: np.ndarray | None = None):
+    """(rows, cols, vals, rank) of the ``k`` largest entries of each row of
+    ``m``, best first; ``keep`` optionally masks entries out beforehand."""
+    rows = np.repeat(np.arange(m.shape[0]), np.diff(m.indptr))
+    cols, vals = m.indices, m.data
+    if keep is not None:
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+    # rows ascending, then value descending (values are cosines in [0, 1])
+    order = np.argsort(rows * 2.0 - vals)
+    rows, cols, vals = rows[order], cols[order], vals[order]
+    rank = _rank(rows, m.shape[0])
+    top = rank < k
+    return rows[top], cols[top], vals[top], rank[top]
+
+
+def _rank(rows: np.ndarray, n: int) -> np.ndarray:
+    """Position of each entry within its run of equal ``rows`` (sorted)."""
+    counts = np.bincount(rows, minlength=n)
+    return np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _prune(x: sparse.csr_matrix, terms: int) -> sparse.csr_matrix:
+    rows, cols, vals, _ = _top_per_row(x, terms)
+    return sparse.csr_matrix((vals, (rows, cols)), shape=x.shape)
+
+
+def _top_k(xq: sparse.csr_matrix, xt: sparse.csr_matrix, src: np.ndarray, targets: np.ndarray, k: int):
+    """Yield (row, col, score, rank) arrays of each target's k best neighbours."""
+    for start in range(0, len(targets), BATCH):
+        batch = targets[start : start + BATCH]
+        sims = (xq[batch] @ xt).tocsr()
+        # other funders only (this also drops the item itself)
+        rows = np.repeat(np.arange(len(batch)), np.diff(sims.indptr))
+        rows, cols, vals, rank = _top_per_row(sims, k, keep=src[batch[rows]] != src[sims.indices])
+        yield batch[rows], cols, vals, rank
+
+
+def _stale_ids(conn: Connection) -> set[int]:
+    """Items without a list, or updated since theirs was computed."""
+    computed = (
+        select(RelatedItem.item_id, func.max(RelatedItem.item_updated_at).label("at"))
+        .group_by(RelatedItem.item_id)
+        .subquery()
+    )
+    stmt = (
+        select(Item.id)
+        .outerjoin(computed, computed.c.item_id == Item.id)
+        .where((computed.c.at == None) | (Item.updated_at > computed.c.at))
+    )
+    return {r[0] for r in conn.execute(stmt)}
+
+
+def _displaced(conn: Connection, xq, x, src, pos_of: dict[int, int], new: np.ndarray, k: int) -> np.ndarray:
+    """Rows (outside ``new``) whose neighbour list a new item would enter."""
+    kth = np.zeros(x.shape[0], dtype=np.float32)
+    stmt = select(RelatedItem.item_id, func.min(RelatedItem.score), func.count()).group_by(RelatedItem.item_id)
+    for item_id, worst, n in conn.execute(stmt):
+        pos = pos_of.get(item_id)
+        if pos is not None and n >= k:
+            kth[pos] = worst
+
+    sims = (xq @ x[new].T).tocoo()
+    rows, cols, vals = sims.row, new[sims.col], sims.data
+    hit = (src[rows] != src[cols]) & (vals > kth[rows])
+    affected = np.unique(rows[hit])
+    return affected[~np.isin(affected, new)]
+
+
+def refresh_related(full: bool = False, k: int = RELATED_K) -> dict:
+    init_db()
+    with engine.connect() as conn:
+        # Checked first: a refresh with nothing stale skips the matrix build.
+        stale = set() if full else _stale_ids(conn)
+        if not full and not stale:
+            items = conn.execute(select(func.count()).select_from(Item)).scalar_one()
+            return {"items": items, "recomputed": 0}
+        # updated_at as stored (a string), to be copied into item_updated_at
+        rows = conn.execute(
+            select(Item.id, Item.source, Item.search_key, type_coerce(Item.updated_at, String).label("updated_at"))
+            .order_by(Item.id)
+        ).all()
+        if not rows:
+            return {"items": 0, "recomputed": 0}
+        ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+        pos_of = {item_id: pos for pos, item_id in enumerate(ids.tolist())}
+        _, src = np.unique([r.source for r in rows], return_inverse=True)
+
+        x = _matrix(rows, src)
+        xq = _prune(x, QUERY_TERMS)
+
+        if full:
+            targets = np.arange(len(rows))
+        else:
+            new = np.array(sorted(pos_of[i] for i in stale if i in pos_of), dtype=np.int64)
+            if len(new) == 0:
+                return {"items": len(rows), "recomputed": 0}
+            targets = np.concatenate([new, _displaced(conn, xq, x, src, pos_of, new, k)])
+
+    # Plain tuples through the DB-API: at ~k rows per item, SQLAlchemy's
+    # per-parameter processing would cost more than the scoring itself.
+    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+    versions = [r.updated_at for r in rows]
+    found = np.zeros(len(rows), dtype=bool)
+    records = []
+    for rows_, cols, vals, rank in _top_k(xq, x.T.tocsr(), src, targets, k):
+        found[rows_] = True
+        records.extend(
+            zip(
+                ids[rows_].tolist(), rank.tolist(), ids[cols].tolist(), vals.tolist(),
+                map(versions.__getitem__, rows_.tolist()), repeat(now),
+            )
+        )
+    # A placeholder row marks an item without neighbours as up to date.
+    lonely = targets[~found[targets]]
+    records.extend((int(ids[pos]), 0, None, 0.0, versions[pos], now) for pos in lonely.tolist())
+
+    target_ids = ids[targets].tolist()
+    with engine.begin() as conn:
+        if full:
+            conn.execute(delete(RelatedItem))
+        else:
+            for start in range(0, len(target_ids), 5000):
+                conn.execute(delete(RelatedItem).where(RelatedItem.item_id.in_(target_ids[start : start + 5000])))
+        if records:
+            conn.exec_driver_sql(
+                "INSERT INTO related_item (item_id, rank, related_id, score, item_updated_at, computed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+
+    return {"items": len(rows), "recomputed": len(targets)}
+
+
+def refresh_related_if_free(full: bool = False, wait: float = 0.0) -> dict | None:
+    """refresh_related() unless another process is already running it.
+
+    With ``wait``, keep trying for the lease that many seconds: a refresh
+    already running may have read the items before the caller's ingest
+    committed, so returning at once could leave those without lists.
+    """
+    deadline = time.monotonic() + wait
+    with LeaseKeeper() as leases:
+        while not leases.acquire("related"):
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(LEASE_POLL)
+        return refresh_related(full=full)
+
+
+def refresh_after_ingest(*results: dict) -> dict | None:
+    """Bring the lists up to date after ingest_once() results that added or changed items."""
+    if any(r["inserted"] or r["updated"] for r in results):
+        return refresh_related_if_free(wait=LEASE_WAIT)
+    return None
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Recompute related-item lists.")
+    ap.add_argument("--full", action="store_true", help="recompute every item, not just new/updated ones")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    result = refresh_related(full=args.full)
+    print(f"Related refresh: items={result['items']} recomputed={result['recomputed']} in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
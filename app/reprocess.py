@@ -0,0 +1,124 @@
+"""
+Offline re-tagging after a change to the keyword tables in app.tagging.
+
+Run:
+  python -m app.reprocess [--batch 5000] [--all]
+
+Streams items whose ``tagger_version`` differs from the current
+``TAGGER_VERSION`` in id order, re-runs ``infer_tags`` on the original entry
+text from the raw feed archive (falling back to the stored title/summary for
+rows that predate it), and bulk-updates only the rows whose tags changed.
+No network access is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from functools import lru_cache
+
+from sqlalchemy import bindparam, select, update
+
+from . import archive
+from .db import engine, init_db
+from .ingest import iter_entries, load_sources
+from .models import Item
+from .search import index_terms, search_key
+from .tagging import TAGGER_VERSION, infer_tags
+
+
+@lru_cache(maxsize=64)
+def _archived_texts(digest: str) -> dict[str, str]:
+    """{entry url: original summary text} for one archived payload."""
+    payload = archive.load(digest) if digest else None
+    if payload is None:
+        return {}
+    return {url: summary_text for _, url, _, summary_text in iter_entries(payload)}
+
+
+def reprocess(batch_size: int = 5000, force: bool = False) -> dict:
+    init_db()
+    defaults = {
+        s.get("name", "Unknown"): (s.get("default_region", "Global"), s.get("default_type", "other"))
+        for s in load_sources()
+    }
+
+    cols = (
+        Item.id, Item.title, Item.url, Item.source, Item.summary,
+        Item.region, Item.item_type, Item.topic, Item.raw_digest,
+    )
+    table = Item.__table__
+    set_tags = {
+        "region": bindparam("b_region"),
+        "item_type": bindparam("b_item_type"),
+        "topic": bindparam("b_topic"),
+        "tagger_version": TAGGER_VERSION,
+    }
+    retag = update(table).where(Item.id == bindparam("b_id")).values(**set_tags)
+    # The topic is part of the search key; only these rows touch the FTS index.
+    retag_with_key = (
+        update(table).where(Item.id == bindparam("b_id")).values(**set_tags, search_key=bindparam("b_search_key"))
+    )
+
+    seen = changed = 0
+    last_id = 0
+    while True:
+        stmt = select(*cols).where(Item.id > last_id).order_by(Item.id).limit(batch_size)
+        if not force:
+            stmt = stmt.where(Item.tagger_version != TAGGER_VERSION)
+
+        # Each batch is read and written in its own short transaction so the
+        # worker can keep ingesting in between.
+        with engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            updates_with_key = []
+            unchanged = []
+            for r in rows:
+                text = _archived_texts(r.raw_digest).get(r.url, r.summary)
+                fallback_region, fallback_type = defaults.get(r.source, ("Global", "other"))
+                tags = infer_tags(r.title, text, fallback_region=fallback_region, fallback_type=fallback_type)
+                if (tags.region, tags.item_type, tags.topic) == (r.region, r.item_type, r.topic):
+                    unchanged.append(r.id)
+                    continue
+                params = {"b_id": r.id, "b_region": tags.region, "b_item_type": tags.item_type, "b_topic": tags.topic}
+                if tags.topic == r.topic:
+                    updates.append(params)
+                else:
+                    params["b_search_key"] = search_key(r.title, r.summary, tags.topic, r.source)
+                    updates_with_key.append(params)
+
+            if updates:
+                conn.execute(retag, updates)
+            if updates_with_key:
+                conn.execute(retag_with_key, updates_with_key)
+                index_terms(conn, (u["b_search_key"] for u in updates_with_key))
+            if unchanged:
+                conn.execute(update(table).where(Item.id.in_(unchanged)).values(tagger_version=TAGGER_VERSION))
+
+        seen += len(rows)
+        changed += len(updates) + len(updates_with_key)
+
+    return {"checked": seen, "changed": changed, "tagger_version": TAGGER_VERSION}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Re-run tagging on rows tagged by an older tagger version.")
+    ap.add_argument("--batch", type=int, default=5000)
+    ap.add_argument("--all", action="store_true", help="re-tag every row, not just stale ones")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    result = reprocess(batch_size=args.batch, force=args.all)
+    print(
+        f"Reprocess complete: checked={result['checked']} changed={result['changed']} "
+        f"version={result['tagger_version']} in {time.perf_counter() - t0:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
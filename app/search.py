@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Normalization here must stay in sync with the JS port in generate_site.py.
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_TOKEN = re.compile(r"[^\W_]+")
+# Combining diacritical mark blocks; left behind by NFKD (é -> e + U+0301).
+_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+# Light en/de suffix stripping, tried in order and repeated until nothing
+# applies; a stem never gets shorter than _MIN_STEM characters.
+_SUFFIXES = (
+    ("ungen", "ung"),
+    ("heiten", "heit"),
+    ("keiten", "keit"),
+    ("ies", "y"),
+    ("ing", ""),
+    ("ed", ""),
+    ("en", ""),
+    ("er", ""),
+    ("es", ""),
+    ("e", ""),
+    ("s", ""),
+)
+_MIN_STEM = 4
+
+# Fuzzy matching: minimum trigram similarity, and how many vocabulary terms
+# one query word may expand to.
+FUZZY_THRESHOLD = 0.45
+FUZZY_MAX_TERMS = 8
+
+
+def fold(s: str) -> str:
+    """Casefold, spell out umlauts (ö -> oe) and strip remaining diacritics."""
+    if s.isascii():
+        return s.lower()
+    s = s.casefold().translate(_UMLAUTS)
+    return _MARKS.sub("", unicodedata.normalize("NFKD", s))
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    for _ in range(3):
+        for suffix, repl in _SUFFIXES:
+            if word.endswith(suffix) and not (suffix == "s" and word.endswith("ss")):
+                candidate = word[: -len(suffix)] + repl
+                if len(candidate) >= _MIN_STEM:
+                    word = candidate
+                    break
+        else:
+            return word
+    return word
+
+
+def tokens(s: str) -> list[str]:
+    return [stem(t) for t in _TOKEN.findall(fold(s))]
+
+
+def search_key(*parts: str | None) -> str:
+    """Normalized, de-duplicated token string stored in ``Item.search_key``."""
+    seen: dict[str, None] = {}
+    for p in parts:
+        for t in tokens(p or ""):
+            seen.setdefault(t, None)
+    return " ".join(seen)
+
+
+def trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+# ---------------------------------------------------------------------------
+# SQLite side: an FTS5 index over item.search_key (kept in sync by triggers)
+# and a trigram -> term table over its vocabulary for typo-tolerant lookups.
+
+_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS item_fts USING fts5(
+        search_key, content='item', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_ai AFTER INSERT ON item BEGIN
+        INSERT INTO item_fts(rowid, search_key) VALUES (new.id, new.search_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_ad AFTER DELETE ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS item_fts_au AFTER UPDATE OF search_key ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, search_key) VALUES ('delete', old.id, old.search_key);
+        INSERT INTO item_fts(rowid, search_key) VALUES (new.id, new.search_key);
+    END
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS search_trigram (
+        trigram TEXT NOT NULL,
+        term TEXT NOT NULL,
+        PRIMARY KEY (trigram, term)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def install(conn: Connection) -> None:
+    """Create the search index and backfill keys for rows that predate it."""
+    created = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'item_fts'")).first() is None
+
+    # Backfill before creating the triggers: the update trigger would try to
+    # delete index entries a fresh external-content index never had.
+    rows = conn.execute(
+        text("SELECT id, title, summary, topic, source FROM item WHERE search_key = ''")
+    ).all()
+    keys = [{"id": r.id, "k": search_key(r.title, r.summary, r.topic, r.source)} for r in rows]
+    if keys:
+        conn.execute(text("UPDATE item SET search_key = :k WHERE id = :id"), keys)
+
+    for ddl in _DDL:
+        conn.execute(text(ddl))
+
+    if created:
+        conn.execute(text("INSERT INTO item_fts(item_fts) VALUES ('rebuild')"))
+        index_terms(conn, (r[0] for r in conn.execute(text("SELECT search_key FROM item"))))
+    else:
+        index_terms(conn, (k["k"] for k in keys))
+
+
+def index_terms(conn: Connection, keys: Iterable[str]) -> None:
+    """Add the vocabulary of ``keys`` to the trigram table."""
+    terms = {t for k in keys for t in k.split()}
+    params = [{"g": g, "t": t} for t in terms for g in trigrams(t)]
+    if params:
+        conn.execute(text("INSERT OR IGNORE INTO search_trigram(trigram, term) VALUES (:g, :t)"), params)
+
+
+def _similar_terms(conn: Connection, term: str) -> list[str]:
+    grams = trigrams(term)
+    placeholders = ", ".join(f":g{i}" for i in range(len(grams)))
+    params = {f"g{i}": g for i, g in enumerate(grams)}
+    # Candidates must share enough trigrams to possibly reach the threshold.
+    params["min"] = max(1, int(FUZZY_THRESHOLD * len(grams)))
+    rows = conn.execute(
+        text(
+            f"SELECT term, COUNT(*) AS shared FROM search_trigram WHERE trigram IN ({placeholders}) "
+            "GROUP BY term HAVING shared >= :min"
+        ),
+        params,
+    ).all()
+    scored = []
+    for t, shared in rows:
+        sim = shared / (len(grams) + len(trigrams(t)) - shared)
+        if sim >= FUZZY_THRESHOLD:
+            scored.append((sim, t))
+    scored.sort(reverse=True)
+    return [t for _, t in scored[:FUZZY_MAX_TERMS]]
+
+
+def match_expression(conn: Connection, q: str) -> str | None:
+    """Build an FTS5 MATCH expression for ``q``: every word must match, each
+    word by exact stem, prefix, or a trigram-similar vocabulary term."""
+    clauses = []
+    for word in dict.fromkeys(tokens(q)):
+        variants = [f'"{word}"*']
+        if len(word) >= 4:
+            variants += [f'"{t}"' for t in _similar_terms(conn, word) if t != word]
+        clauses.append("(" + " OR ".join(variants) + ")")
+    return " AND ".join(clauses) or None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 from dataclasses import dataclass
 
@@ -25,6 +27,23 @@ TOPIC_KEYWORDS = {
 }
 
 
+# Changes whenever the keyword tables change; stored on Item.tagger_version so
+# `python -m app.reprocess` can find rows tagged by an older table.
+TAGGER_VERSION = hashlib.sha256(
+    json.dumps([REGION_KEYWORDS, TYPE_KEYWORDS, TOPIC_KEYWORDS]).encode("utf-8")
+).hexdigest()[:12]
+
+
+def _compile(table: dict[str, list[str]]) -> list[tuple[str, re.Pattern]]:
+    # One alternation per tag: same result as trying each keyword in turn.
+    return [(tag, re.compile("|".join(f"(?:{k})" for k in kws))) for tag, kws in table.items()]
+
+
+_TYPE_PATTERNS = _compile(TYPE_KEYWORDS)
+_REGION_PATTERNS = _compile(REGION_KEYWORDS)
+_TOPIC_PATTERNS = _compile(TOPIC_KEYWORDS)
+
+
 @dataclass
 class Tags:
     region: str
@@ -37,22 +56,22 @@ def infer_tags(title: str, summary: str, fallback_region: str = "Global", fallba
 
     # type
     item_type = fallback_type
-    for t, kws in TYPE_KEYWORDS.items():
-        if any(re.search(k, text) for k in kws):
+    for t, pattern in _TYPE_PATTERNS:
+        if pattern.search(text):
             item_type = t
             break
 
     # region
     region = fallback_region
-    for r, kws in REGION_KEYWORDS.items():
-        if any(re.search(k, text) for k in kws):
+    for r, pattern in _REGION_PATTERNS:
+        if pattern.search(text):
             region = r
             break
 
     # topic
     topic = "General"
-    for tp, kws in TOPIC_KEYWORDS.items():
-        if any(re.search(k, text) for k in kws):
+    for tp, pattern in _TOPIC_PATTERNS:
+        if pattern.search(text):
             topic = tp
             break
 
@@ -1,24 +1,45 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from .db import init_db
 from .ingest import ingest_once
+from .related import LEASE_WAIT, refresh_related_if_free
 from .config import settings
 
 
+def ingest_round(limit_per_source: int = 40) -> None:
+    # INGEST_WORKERS > 1 runs several ingesters that split sources by lease.
+    workers = max(1, settings.ingest_workers)
+    if workers == 1:
+        ingest_once(limit_per_source=limit_per_source)
+    else:
+        # Shared by this round's threads so none repeats a finished source.
+        done: set[str] = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+            futures = [pool.submit(ingest_once, limit_per_source=limit_per_source, done=done) for _ in range(workers)]
+            for f in futures:
+                f.result()
+
+    # Only new/edited items (and lists they displace) are recomputed. Every
+    # round, not only after changes: items whose refresh was skipped earlier
+    # (lease held elsewhere, timeout) are still stale and get picked up here.
+    refresh_related_if_free(wait=LEASE_WAIT)
+
+
 def main() -> None:
     init_db()
 
     scheduler = BackgroundScheduler(timezone=settings.timezone)
     # Pull new items every 6 hours
-    scheduler.add_job(ingest_once, "interval", hours=6, kwargs={"limit_per_source": 40})
+    scheduler.add_job(ingest_round, "interval", hours=6, kwargs={"limit_per_source": 40})
     scheduler.start()
 
     # First run right away
-    ingest_once(limit_per_source=40)
+    ingest_round(limit_per_source=40)
 
     while True:
         time.sleep(3600)
@@ -0,0 +1,75 @@
+"""Shared helpers for building throwaway SQLite databases with synthetic items."""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REGIONS = ["North America", "Europe", "Asia", "Global"]
+TYPES = ["funding", "cfp", "conference", "journal", "other"]
+TOPICS = ["General", "International Business", "Management", "HR", "Sustainability", "Innovation/Tech"]
+WORDS = (
+    "grant fellowship call proposals research management leadership innovation digital "
+    "sustainability conference workshop symposium special issue journal deadline europe "
+    "horizon erasmus austria germany asia china india funding förderung forschung "
+    "ausschreibung stipendium organization talent strategy entrepreneurship"
+).split()
+
+
+def use_temp_db() -> Path:
+    """Point DB_PATH at a fresh temp file. Must run before importing app.*."""
+    path = Path(tempfile.mkdtemp(prefix="mss-bench-")) / "bench.sqlite"
+    os.environ["DB_PATH"] = str(path)
+    return path
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_rows(n: int, seed: int = 0) -> list[dict]:
+    from app.search import search_key
+    from app.tagging import infer_tags
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(n):
+        published = now - timedelta(minutes=rng.randrange(60 * 24 * 60))
+        url = f"https://example.org/item/{i}"
+        title = _sentence(rng, 8).capitalize()
+        summary = _sentence(rng, 40)
+        tags = infer_tags(title, summary, fallback_region=rng.choice(REGIONS), fallback_type=rng.choice(TYPES))
+        row = {
+            "title": title,
+            "url": url,
+            "source": f"Source {i % 40}",
+            "published": published if rng.random() > 0.1 else None,
+            "fetched_at": now,
+            "updated_at": now,
+            "item_type": tags.item_type,
+            "region": tags.region,
+            "topic": tags.topic,
+            "summary": summary,
+            "fingerprint": f"{i:064x}",
+        }
+        row["search_key"] = search_key(row["title"], row["summary"], row["topic"], row["source"])
+        rows.append(row)
+    return rows
+
+
+def seed_items(n: int, seed: int = 0) -> None:
+    """Insert ``n`` synthetic items into the configured database via Core executemany."""
+    from app.db import engine, init_db
+    from app.models import Item
+    from app.search import index_terms
+
+    init_db()
+    rows = make_rows(n, seed)
+    with engine.begin() as conn:
+        conn.execute(Item.__table__.delete())
+        conn.execute(Item.__table__.insert(), rows)
+        index_terms(conn, (r["search_key"] for r in rows))
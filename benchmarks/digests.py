@@ -0,0 +1,65 @@
+"""
+Personalized digest benchmark: bulk build vs. one query + render per subscriber.
+
+Run from the repo root:
+  python benchmarks/digests.py [--items 20000] [--subscribers 50000] [--naive-sample 1000]
+
+The naive path is timed on a sample of subscribers and extrapolated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _synthetic import REGIONS, TOPICS, TYPES, seed_items, use_temp_db  # noqa: E402
+
+use_temp_db()
+
+from app.db import fetch_item_rows  # noqa: E402
+from app.digest import DIGEST_ITEMS, DigestPrefs, build_digests, digest_stmt, render_digest  # noqa: E402
+
+
+def _subscribers(n: int, seed: int = 1) -> list[DigestPrefs]:
+    rng = random.Random(seed)
+
+    def pick(options: list[str], p_all: float) -> str:
+        return "All" if rng.random() < p_all else rng.choice(options)
+
+    return [DigestPrefs(pick(REGIONS, 0.3), pick(TYPES, 0.4), pick(TOPICS, 0.6)) for _ in range(n)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=20_000)
+    ap.add_argument("--subscribers", type=int, default=50_000)
+    ap.add_argument("--naive-sample", type=int, default=1_000)
+    args = ap.parse_args()
+
+    seed_items(args.items)
+    subs = _subscribers(args.subscribers)
+    print(f"{args.items} items, {len(subs)} subscribers, {len(set(subs))} distinct preference combinations")
+
+    out = Path(tempfile.mkdtemp(prefix="mss-digests-"))
+    t0 = time.perf_counter()
+    build_digests(subs, out_dir=out)
+    bulk = time.perf_counter() - t0
+    print(f"  bulk build_digests     {bulk:8.2f} s  ({len(list(out.glob('*.xml')))} files)")
+
+    sample = subs[: args.naive_sample]
+    t0 = time.perf_counter()
+    for p in sample:
+        render_digest(p, fetch_item_rows(digest_stmt(p).limit(DIGEST_ITEMS)))
+    naive = (time.perf_counter() - t0) * len(subs) / len(sample)
+    print(f"  per-subscriber (est.)  {naive:8.2f} s  (timed on {len(sample)})")
+    print(f"  speedup                {naive / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Read-path benchmark: full SQLModel Item instances vs. column-selected ItemRows.
+
+Run from the repo root:
+  python benchmarks/read_path.py [--sizes 10000 100000]
+
+For each size, loads every row both ways and reports wall time (untraced) and
+the peak memory traced by tracemalloc in a separate run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _synthetic import seed_items, use_temp_db  # noqa: E402
+
+use_temp_db()
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db import fetch_item_rows, get_session  # noqa: E402
+from app.models import ITEM_ROW_COLUMNS, Item  # noqa: E402
+
+
+def _load_orm() -> list:
+    with get_session() as session:
+        return session.exec(select(Item).order_by(Item.fetched_at.desc())).scalars().all()
+
+
+def _load_rows() -> list:
+    return fetch_item_rows(select(*ITEM_ROW_COLUMNS).order_by(Item.fetched_at.desc()))
+
+
+def _measure(fn) -> tuple[float, float, int]:
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    del out
+
+    tracemalloc.start()
+    out = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, len(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = ap.parse_args()
+
+    for n in args.sizes:
+        seed_items(n)
+        print(f"{n} rows")
+        for label, fn in (("SQLModel Item", _load_orm), ("ItemRow", _load_rows)):
+            fn()  # warm the page cache / statement cache
+            elapsed, peak_mb, count = _measure(fn)
+            print(f"  {label:<14} {elapsed * 1000:9.1f} ms  peak {peak_mb:8.1f} MiB  ({count} rows)")
+
+
+if __name__ == "__main__":
+    main()
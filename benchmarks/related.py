@@ -0,0 +1,78 @@
+"""
+Related-items benchmark: full TF-IDF rebuild, then an incremental refresh.
+
+Run from the repo root:
+  python benchmarks/related.py [--items 100000] [--new 500]
+
+Uses a Zipf-distributed synthetic vocabulary (the small word list in
+_synthetic would make every item similar to every other one).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _synthetic import use_temp_db  # noqa: E402
+
+use_temp_db()
+
+from app.db import engine, init_db  # noqa: E402
+from app.models import Item  # noqa: E402
+from app.related import refresh_related  # noqa: E402
+from app.search import search_key  # noqa: E402
+
+
+def _rows(start: int, n: int, rng: random.Random, vocab: list[str], cum_weights: list[float]) -> list[dict]:
+    now = datetime.utcnow()
+    rows = []
+    for i in range(start, start + n):
+        title = " ".join(rng.choices(vocab, cum_weights=cum_weights, k=8))
+        summary = " ".join(rng.choices(vocab, cum_weights=cum_weights, k=35))
+        source = f"Source {i % 40}"
+        rows.append(
+            {
+                "title": title, "url": f"https://example.org/{i}", "source": source, "fetched_at": now,
+                "updated_at": now, "summary": summary, "fingerprint": f"{i:064x}",
+                "search_key": search_key(title, summary, "General", source),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100_000)
+    ap.add_argument("--new", type=int, default=500)
+    ap.add_argument("--vocab", type=int, default=30_000)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(5, 10))) for _ in range(args.vocab)]
+    cum_weights = list(accumulate(1 / (r + 1) for r in range(len(vocab))))
+
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(Item.__table__.insert(), _rows(0, args.items, rng, vocab, cum_weights))
+
+    t0 = time.perf_counter()
+    result = refresh_related(full=True)
+    print(f"  full rebuild   items={result['items']:>7} recomputed={result['recomputed']:>7}  {time.perf_counter() - t0:6.2f} s")
+
+    with engine.begin() as conn:
+        conn.execute(Item.__table__.insert(), _rows(args.items, args.new, rng, vocab, cum_weights))
+    t0 = time.perf_counter()
+    result = refresh_related()
+    print(f"  incremental    items={result['items']:>7} recomputed={result['recomputed']:>7}  {time.perf_counter() - t0:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Startup import-time benchmark for the web and worker entry points.
+
+Run from the repo root:
+  python benchmarks/startup_importtime.py [--runs 5] [--top 10]
+
+Each run starts a fresh interpreter with `-X importtime` and imports the module
+that `uvicorn app.main:app` / `python -m app.worker` would load, then reports
+the median total import time, the packages with the largest self import time,
+and which of the optional heavy dependencies were pulled in at startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    "web (uvicorn app.main:app)": "import app.main",
+    "worker (python -m app.worker)": "import app.worker",
+}
+
+# Dependencies the web process should only load on first use.
+WATCH = ("feedparser", "yaml", "requests", "openai", "dotenv", "apscheduler")
+
+
+def _run(code: str) -> tuple[int, dict[str, int]]:
+    env = dict(os.environ)
+    env.setdefault("DB_PATH", str(Path(tempfile.gettempdir()) / "mss-bench.sqlite"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    by_package: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, _, name = line.split("|", 2)
+        package = name.strip().split(".")[0]
+        self_us = int(head.split(":", 1)[1])
+        total += self_us
+        by_package[package] = by_package.get(package, 0) + self_us
+    return total, by_package
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    for label, code in TARGETS.items():
+        totals = []
+        by_package: dict[str, int] = {}
+        for _ in range(args.runs):
+            total, by_package = _run(code)
+            totals.append(total)
+
+        print(f"{label}")
+        print(f"  median import time: {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+        for pkg, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+            print(f"    {us / 1000:8.1f} ms  {pkg}")
+        heavy = [m for m in WATCH if m in by_package]
+        print(f"  heavy deps loaded at startup: {', '.join(heavy) or 'none'}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,36 +2,47 @@
 ManagementScholarSearch static-site generator.
 
 Run locally:
-  py generate_site.py
+  py generate_site.py               # ingest, then build
+  py generate_site.py --no-ingest   # rebuild from the current DB only
 
 It will:
   1) Ingest RSS sources into a local SQLite db (data/mss.sqlite)
-  2) Generate a static site into ./docs/ (GitHub Pages)
+  2) Generate a static site into ./docs/ (GitHub Pages) from a read-only
+     snapshot of the db, so it can run while the worker is ingesting:
+     pre-rendered, paginated listing pages per region x type (docs/index.html
+     is All x funding, the rest under docs/browse/), items.json for
+     client-side search, and RSS feeds (all regions plus one per region)
 
 Then publish by pushing to GitHub.
 """
 
 from __future__ import annotations
 
+import argparse
+import html
 import json
 import os
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from dotenv import load_dotenv
-from sqlmodel import select
-
-from app.config import settings
-from app.db import get_session, init_db
-from app.feed import build_rss
-from app.ingest import ingest_once
-from app.models import Item
 
 ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "data"
 DOCS_DIR = ROOT / "docs"
 
+# You said you do not want journal articles on the site.
+TYPES = ["All", "funding", "cfp", "conference", "other"]
+# Funding-first default view (docs/index.html)
+DEFAULT_REGION = "All"
+DEFAULT_TYPE = "funding"
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "25"))
+
 
 def _load_env() -> None:
     """Load .env when running locally (so MAILERLITE_FORM_URL etc. are available)."""
@@ -46,7 +57,20 @@ def _ensure_local_db_path() -> None:
     os.environ["DB_PATH"] = str((DATA_DIR / "mss.sqlite").resolve())
 
 
-def _item_to_dict(it: Item) -> dict[str, Any]:
+# Before importing app.*: app.config reads DB_PATH at import time.
+_load_env()
+_ensure_local_db_path()
+
+from sqlalchemy import select  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db import fetch_item_rows, fetch_related, init_db, read_snapshot  # noqa: E402
+from app.feed import build_rss  # noqa: E402
+from app.models import ITEM_ROW_COLUMNS, Item, ItemRow  # noqa: E402
+from app.search import FUZZY_MAX_TERMS, FUZZY_THRESHOLD  # noqa: E402
+
+
+def _item_to_dict(it: ItemRow, related: list[dict[str, str]]) -> dict[str, Any]:
     dt = it.published or it.fetched_at
     return {
         "title": it.title,
@@ -58,15 +82,102 @@ def _item_to_dict(it: Item) -> dict[str, Any]:
         "item_type": it.item_type,
         "topic": it.topic,
         "summary": it.summary or "",
+        "search_key": it.search_key,
+        "related": related,
     }
 
 
-def _render_index(items: list[dict[str, Any]]) -> str:
-    # Minimal, fast, static UI with client-side filtering.
-    regions = ["All"] + settings.regions
+def _slug(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", s.lower()).strip("-")
+
+
+# More forgiving matching to reduce "No matching items" caused by label
+# variants. Must stay in sync with matches() in the page script.
+def _region_ok(value: str, region: str) -> bool:
+    return (
+        region == "All"
+        or value == region
+        or (region == "Europe" and value in ("EU", "European Union"))
+        or (region == "North America" and value in ("USA", "United States", "Canada"))
+    )
+
+
+def _type_ok(value: str, item_type: str) -> bool:
+    return (
+        item_type == "All"
+        or value == item_type
+        or (item_type == "funding" and value in ("grant", "call", "cfp"))
+        or (item_type == "cfp" and value == "call")
+    )
+
+
+def _page_path(region: str, item_type: str, page: int = 1) -> str:
+    """Path of a pre-rendered listing page, relative to docs/."""
+    if (region, item_type, page) == (DEFAULT_REGION, DEFAULT_TYPE, 1):
+        return "index.html"
+    return f"browse/{_slug(region)}/{_slug(item_type)}/" + ("index.html" if page == 1 else f"{page}.html")
+
+
+def _card_html(it: dict[str, Any]) -> str:
+    # Same markup as card() in the page script.
+    e = html.escape
+    summary = f'<p class="mb-0">{e(it["summary"])}</p>' if it["summary"] else ""
+    related = ""
+    if it["related"]:
+        links = " · ".join(
+            f'<a href="{e(r["url"])}" target="_blank" rel="noopener">{e(r["title"])}</a> '
+            f'<span class="text-muted">({e(r["source"])})</span>'
+            for r in it["related"]
+        )
+        related = f'<div class="small mt-2"><span class="text-muted">Related:</span> {links}</div>'
+    return f"""<div class="card item-card">
+            <div class="card-body">
+              <div class="d-flex justify-content-between flex-wrap gap-2">
+                <h5 class="mb-1"><a href="{e(it["url"])}" target="_blank" rel="noopener">{e(it["title"])}</a></h5>
+                <div class="small text-muted">{e(it["date"])} · {e(it["source"])}</div>
+              </div>
+              <div class="small text-muted mb-2">
+                <span class="badge text-bg-light border">{e(it["region"])}</span>
+                <span class="badge text-bg-light border">{e(it["item_type"])}</span>
+                <span class="badge text-bg-light border">{e(it["topic"])}</span>
+              </div>
+              {summary}
+              {related}
+            </div>
+          </div>"""
+
 
-    # You said you do not want journal articles on the site.
-    types = ["All", "funding", "cfp", "conference", "other"]
+def _pager_html(region: str, item_type: str, page: int, pages: int, prefix: str) -> str:
+    if pages <= 1:
+        return ""
+    newer = (
+        f'<a class="btn btn-outline-secondary btn-sm" href="{prefix}{_page_path(region, item_type, page - 1)}">« Newer</a>'
+        if page > 1
+        else "<span></span>"
+    )
+    older = (
+        f'<a class="btn btn-outline-secondary btn-sm" href="{prefix}{_page_path(region, item_type, page + 1)}">Older »</a>'
+        if page < pages
+        else "<span></span>"
+    )
+    return f"""<nav id="pager" class="d-flex justify-content-between align-items-center mt-3">
+            {newer}<span class="small text-muted">Page {page} of {pages}</span>{older}
+          </nav>"""
+
+
+def _render_page(
+    cards: list[dict[str, Any]],
+    region: str,
+    item_type: str,
+    page: int,
+    pages: int,
+    generated_at: str,
+) -> str:
+    # Server-rendered listing page; the script only enhances it (search,
+    # instant filter switching) once items.json has loaded.
+    regions = ["All"] + settings.regions
+    prefix = "../" * _page_path(region, item_type, page).count("/")
+    page_urls = {f"{r}|{t}": prefix + _page_path(r, t) for r in regions for t in TYPES}
 
     # AdSense: script loads only if client id is set.
     ads_script = ""
@@ -102,16 +213,25 @@ def _render_index(items: list[dict[str, Any]]) -> str:
         </div>
         """
 
-    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    region_feed = ""
+    if region != "All":
+        region_feed = (
+            f'<div class="small">{html.escape(region)}: '
+            f'<a href="{prefix}feeds/{_slug(region)}.xml">feeds/{_slug(region)}.xml</a></div>'
+        )
+    browse = " · ".join(f'<a href="{prefix}{_page_path(r, item_type)}">{html.escape(r)}</a>' for r in regions)
+    cards_html = "\n          ".join(_card_html(it) for it in cards)
+    title = settings.site_name if page == 1 else f"{settings.site_name} – page {page}"
 
-    # Basic HTML with Bootstrap CDN. Filtering happens in JS using docs/assets/items.json.
+    # Basic HTML with Bootstrap CDN. The first PAGE_SIZE cards are in the
+    # page itself; search and filtering use docs/assets/items.json.
     # Newsletter subscribe button is populated client-side from docs/assets/public_config.json
     return f"""<!doctype html>
 <html lang="en">
   <head>
     <meta charset="utf-8" />
     <meta name="viewport" content="width=device-width, initial-scale=1" />
-    <title>{settings.site_name}</title>
+    <title>{title}</title>
     <meta name="description" content="Research funding, CFPs, and conferences in management & international business." />
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet" />
     {ads_script}
@@ -125,7 +245,7 @@ def _render_index(items: list[dict[str, Any]]) -> str:
   <body>
     <nav class="navbar navbar-expand-lg bg-white border-bottom">
       <div class="container py-1">
-        <span class="navbar-brand fw-semibold brand">{settings.site_name}</span>
+        <a class="navbar-brand fw-semibold brand" href="{prefix}index.html">{settings.site_name}</a>
         <div class="ms-auto small text-muted">Updated: {generated_at}</div>
       </div>
     </nav>
@@ -139,13 +259,13 @@ def _render_index(items: list[dict[str, Any]]) -> str:
                 <div class="col-md-3">
                   <label class="form-label">Region</label>
                   <select class="form-select" id="regionSelect">
-                    {''.join([f'<option value="{r}">{r}</option>' for r in regions])}
+                    {''.join([f'<option value="{r}"{" selected" if r == region else ""}>{r}</option>' for r in regions])}
                   </select>
                 </div>
                 <div class="col-md-3">
                   <label class="form-label">Type</label>
                   <select class="form-select" id="typeSelect">
-                    {''.join([f'<option value="{t}">{t}</option>' for t in types])}
+                    {''.join([f'<option value="{t}"{" selected" if t == item_type else ""}>{t}</option>' for t in TYPES])}
                   </select>
                 </div>
                 <div class="col-md-6">
@@ -153,11 +273,16 @@ def _render_index(items: list[dict[str, Any]]) -> str:
                   <input class="form-control" id="searchInput" placeholder="e.g., grant, fellowship, call for papers" />
                 </div>
               </div>
+              <noscript><div class="small mt-2">Region: {browse}</div></noscript>
             </div>
           </div>
 
-          <div id="results" class="d-flex flex-column gap-3"></div>
-          <div id="emptyState" class="alert alert-info d-none">No matching items.</div>
+          <div id="results" class="d-flex flex-column gap-3">
+          {cards_html}
+          </div>
+          <div id="more"></div>
+          <div id="emptyState" class="alert alert-info{"" if not cards else " d-none"}">No matching items.</div>
+          {_pager_html(region, item_type, page, pages, prefix)}
         </div>
 
         <div class="col-lg-3">
@@ -177,7 +302,8 @@ def _render_index(items: list[dict[str, Any]]) -> str:
               </div>
 
               <hr>
-              <div class="small">RSS feed: <a href="feeds/newsletter.xml">feeds/newsletter.xml</a></div>
+              <div class="small">RSS feed: <a href="{prefix}feeds/newsletter.xml">feeds/newsletter.xml</a></div>
+              {region_feed}
             </div>
           </div>
 
@@ -187,12 +313,108 @@ def _render_index(items: list[dict[str, Any]]) -> str:
     </main>
 
     <script>
-      const state = {{ items: [], filtered: [] }};
+      const ROOT = '{prefix}';
+      const PAGES = {json.dumps(page_urls, ensure_ascii=False)};
+      const WINDOW = 30;
+      const state = {{ items: null, filtered: [], shown: 0, nodes: new Map() }};
+
+      // Search mirrors app/search.py: fold umlauts/diacritics, light en/de
+      // stemming, then look words up in an inverted index built once at load
+      // (prefix matches via the sorted vocabulary, typos via trigrams).
+      const SUFFIXES = [['ungen', 'ung'], ['heiten', 'heit'], ['keiten', 'keit'], ['ies', 'y'], ['ing', ''],
+                        ['ed', ''], ['en', ''], ['er', ''], ['es', ''], ['e', ''], ['s', '']];
+      const search = {{ terms: new Map(), sorted: [], grams: new Map() }};
+
+      function fold(s) {{
+        return (s || '').toLowerCase().replace(/ß/g, 'ss')
+          .replace(/ä/g, 'ae').replace(/ö/g, 'oe').replace(/ü/g, 'ue')
+          .normalize('NFKD').replace(/[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]/g, '');
+      }}
+
+      function stem(w) {{
+        for (let round = 0; round < 3; round++) {{
+          let changed = false;
+          for (const [suf, rep] of SUFFIXES) {{
+            if (w.endsWith(suf) && !(suf === 's' && w.endsWith('ss'))) {{
+              const c = w.slice(0, -suf.length) + rep;
+              if (c.length >= 4) {{ w = c; changed = true; break; }}
+            }}
+          }}
+          if (!changed) break;
+        }}
+        return w;
+      }}
+
+      function tokens(s) {{ return (fold(s).match(/[\\p{{L}}\\p{{N}}]+/gu) || []).map(stem); }}
+
+      function trigrams(t) {{
+        const p = '  ' + t + ' ';
+        const out = new Set();
+        for (let i = 0; i < p.length - 2; i++) out.add(p.slice(i, i + 3));
+        return out;
+      }}
+
+      function buildIndex() {{
+        state.items.forEach((it, i) => {{
+          for (const t of (it.search_key || '').split(' ')) {{
+            if (!t) continue;
+            let ids = search.terms.get(t);
+            if (!ids) {{
+              ids = [];
+              search.terms.set(t, ids);
+              for (const g of trigrams(t)) {{
+                if (!search.grams.has(g)) search.grams.set(g, []);
+                search.grams.get(g).push(t);
+              }}
+            }}
+            ids.push(i);
+          }}
+        }});
+        search.sorted = [...search.terms.keys()].sort();
+      }}
+
+      function variants(word) {{
+        const out = new Set();
+        let lo = 0, hi = search.sorted.length;
+        while (lo < hi) {{
+          const mid = (lo + hi) >> 1;
+          if (search.sorted[mid] < word) lo = mid + 1; else hi = mid;
+        }}
+        for (let i = lo; i < search.sorted.length && search.sorted[i].startsWith(word); i++) out.add(search.sorted[i]);
+
+        if (word.length >= 4) {{
+          const grams = trigrams(word);
+          const shared = new Map();
+          for (const g of grams) for (const t of (search.grams.get(g) || [])) shared.set(t, (shared.get(t) || 0) + 1);
+          const scored = [];
+          for (const [t, n] of shared) {{
+            const sim = n / (grams.size + trigrams(t).size - n);
+            if (sim >= {FUZZY_THRESHOLD}) scored.push([sim, t]);
+          }}
+          scored.sort((a, b) => b[0] - a[0] || (a[1] < b[1] ? 1 : a[1] > b[1] ? -1 : 0));
+          for (const [, t] of scored.slice(0, {FUZZY_MAX_TERMS})) out.add(t);
+        }}
+        return out;
+      }}
 
-      function norm(s) {{ return (s || '').toLowerCase(); }}
+      // Indexes of items matching every query word, or null for an empty query.
+      function searchIds(q) {{
+        const words = [...new Set(tokens(q))];
+        // Only punctuation ("??", "-"): no word can match anything (as in app.main).
+        if (!words.length) return q.trim() ? new Set() : null;
+        let result = null;
+        for (const w of words) {{
+          const ids = new Set();
+          for (const t of variants(w)) for (const i of search.terms.get(t)) ids.add(i);
+          result = result === null ? ids : new Set([...result].filter(i => ids.has(i)));
+          if (!result.size) break;
+        }}
+        return result;
+      }}
 
       // More forgiving matching to reduce "No matching items" caused by label variants.
-      function matches(it, region, type, q) {{
+      // Mirrors _region_ok/_type_ok in generate_site.py.
+      function matches(it, region, type) {{
         const itRegion = it.region || '';
         const itType = it.item_type || '';
 
@@ -212,54 +434,83 @@ def _render_index(items: list[dict[str, Any]]) -> str:
           if (!typeOk) return false;
         }}
 
-        if (q) {{
-          const hay = norm(it.title + ' ' + it.summary + ' ' + it.topic + ' ' + it.source);
-          if (!hay.includes(q)) return false;
-        }}
         return true;
       }}
 
-      function render() {{
-        const box = document.getElementById('results');
-        box.innerHTML = '';
-        const empty = document.getElementById('emptyState');
-        if (!state.filtered.length) {{
-          empty.classList.remove('d-none');
-          return;
-        }}
-        empty.classList.add('d-none');
+      function esc(s) {{
+        return String(s ?? '').replace(/[&<>"']/g, c => ({{ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;' }})[c]);
+      }}
 
-        for (const it of state.filtered) {{
-          const card = document.createElement('div');
-          card.className = 'card item-card';
-          card.innerHTML = `
+      // Same markup as _card_html() in generate_site.py; built once per item.
+      function card(i) {{
+        let node = state.nodes.get(i);
+        if (node) return node;
+        const it = state.items[i];
+        node = document.createElement('div');
+        node.className = 'card item-card';
+        node.innerHTML = `
             <div class="card-body">
               <div class="d-flex justify-content-between flex-wrap gap-2">
-                <h5 class="mb-1"><a href="${{it.url}}" target="_blank" rel="noopener">${{it.title}}</a></h5>
-                <div class="small text-muted">${{it.date}} · ${{it.source}}</div>
+                <h5 class="mb-1"><a href="${{esc(it.url)}}" target="_blank" rel="noopener">${{esc(it.title)}}</a></h5>
+                <div class="small text-muted">${{esc(it.date)}} · ${{esc(it.source)}}</div>
               </div>
               <div class="small text-muted mb-2">
-                <span class="badge text-bg-light border">${{it.region}}</span>
-                <span class="badge text-bg-light border">${{it.item_type}}</span>
-                <span class="badge text-bg-light border">${{it.topic}}</span>
+                <span class="badge text-bg-light border">${{esc(it.region)}}</span>
+                <span class="badge text-bg-light border">${{esc(it.item_type)}}</span>
+                <span class="badge text-bg-light border">${{esc(it.topic)}}</span>
               </div>
-              ${{it.summary ? `<p class="mb-0">${{it.summary}}</p>` : ''}}
+              ${{it.summary ? `<p class="mb-0">${{esc(it.summary)}}</p>` : ''}}
+              ${{it.related.length ? `<div class="small mt-2"><span class="text-muted">Related:</span> ${{
+                it.related.map(r => `<a href="${{esc(r.url)}}" target="_blank" rel="noopener">${{esc(r.title)}}</a> <span class="text-muted">(${{esc(r.source)}})</span>`).join(' · ')
+              }}</div>` : ''}}
             </div>`;
-          box.appendChild(card);
-        }}
+        state.nodes.set(i, node);
+        return node;
+      }}
+
+      // Windowed rendering: WINDOW cards at a time, more as #more scrolls into view.
+      function renderMore() {{
+        const end = Math.min(state.shown + WINDOW, state.filtered.length);
+        const frag = document.createDocumentFragment();
+        for (let k = state.shown; k < end; k++) frag.appendChild(card(state.filtered[k]));
+        document.getElementById('results').appendChild(frag);
+        state.shown = end;
+      }}
+
+      function render() {{
+        document.getElementById('results').replaceChildren();
+        state.shown = 0;
+        document.getElementById('emptyState').classList.toggle('d-none', state.filtered.length > 0);
+        const pager = document.getElementById('pager');
+        if (pager) pager.remove();
+        renderMore();
       }}
 
       function applyFilters() {{
         const region = document.getElementById('regionSelect').value;
         const type = document.getElementById('typeSelect').value;
-        const q = norm(document.getElementById('searchInput').value.trim());
-        state.filtered = state.items.filter(it => matches(it, region, type, q));
+        if (state.items === null) {{
+          // Not enhanced yet: the pre-rendered page for this filter will do.
+          const url = PAGES[region + '|' + type];
+          if (url) location.href = url;
+          return;
+        }}
+        const hits = searchIds(document.getElementById('searchInput').value);
+        state.filtered = [];
+        state.items.forEach((it, i) => {{
+          if ((hits === null || hits.has(i)) && matches(it, region, type)) state.filtered.push(i);
+        }});
         render();
       }}
 
+      function debounce(fn, ms) {{
+        let timer;
+        return () => {{ clearTimeout(timer); timer = setTimeout(fn, ms); }};
+      }}
+
       async function loadPublicConfig() {{
         try {{
-          const resp = await fetch('assets/public_config.json', {{ cache: 'no-store' }});
+          const resp = await fetch(ROOT + 'assets/public_config.json', {{ cache: 'no-store' }});
           if (!resp.ok) return;
           const cfg = await resp.json();
           const url = (cfg.mailerlite_form_url || '').trim();
@@ -273,21 +524,29 @@ def _render_index(items: list[dict[str, Any]]) -> str:
         }} catch (e) {{}}
       }}
 
-      async function boot() {{
-        await loadPublicConfig();
-
-        const resp = await fetch('assets/items.json');
-        state.items = await resp.json();
-
-        // Funding-first default view
-        const typeSel = document.getElementById('typeSelect');
-        if (typeSel) typeSel.value = 'funding';
-
-        applyFilters();
+      async function loadItems() {{
+        const resp = await fetch(ROOT + 'assets/items.json');
+        const items = await resp.json();
+        state.items = items;
+        buildIndex();
+        // A query typed before the index was ready.
+        if (document.getElementById('searchInput').value.trim()) applyFilters();
+      }}
 
+      function boot() {{
+        // The pre-rendered cards stay as they are until the user changes something.
         document.getElementById('regionSelect').addEventListener('change', applyFilters);
         document.getElementById('typeSelect').addEventListener('change', applyFilters);
-        document.getElementById('searchInput').addEventListener('input', applyFilters);
+        document.getElementById('searchInput').addEventListener('input', debounce(() => {{
+          if (state.items !== null) applyFilters();
+        }}, 150));
+
+        new IntersectionObserver(entries => {{
+          if (entries[0].isIntersecting && state.items !== null && state.shown < state.filtered.length) renderMore();
+        }}, {{ rootMargin: '600px' }}).observe(document.getElementById('more'));
+
+        loadPublicConfig();
+        loadItems();
       }}
 
       boot();
@@ -323,44 +582,114 @@ def _write_public_config() -> None:
     cfg_path.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def main() -> None:
-    _load_env()
-    _ensure_local_db_path()
+def _listing_pages(items: list[dict[str, Any]], generated_at: str) -> Iterator[tuple[str, str]]:
+    """(path under docs/, html) of every page of every region x type listing."""
+    for region in ["All"] + settings.regions:
+        for item_type in TYPES:
+            matching = [it for it in items if _region_ok(it["region"], region) and _type_ok(it["item_type"], item_type)]
+            pages = max(1, -(-len(matching) // PAGE_SIZE))
+            for page in range(1, pages + 1):
+                cards = matching[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+                yield _page_path(region, item_type, page), _render_page(
+                    cards, region, item_type, page, pages, generated_at
+                )
+
+
+def _feeds(items: list[ItemRow]) -> Iterator[tuple[str, str]]:
+    """The newsletter feed (all regions) plus one feed per region."""
+    limit = int(os.getenv("NEWSLETTER_ITEMS", "60"))
+    description = "Research funding, CFPs, and conferences in management & international business."
+    yield "feeds/newsletter.xml", build_rss(
+        title=f"{settings.site_name} – Weekly Digest",
+        link=settings.public_base_url.rstrip("/"),
+        description=description,
+        items=items[:limit],
+    )
+    for region in settings.regions:
+        path = f"feeds/{_slug(region)}.xml"
+        yield path, build_rss(
+            title=f"{settings.site_name} – {region}",
+            link=settings.public_base_url.rstrip("/"),
+            description=description,
+            items=[it for it in items if _region_ok(it.region, region)][:limit],
+            self_path=f"/{path}",
+        )
+
+
+def _write_doc(file: tuple[str, str]) -> None:
+    path, text = file
+    target = DOCS_DIR / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text, encoding="utf-8")
+
+
+def _ingest() -> None:
+    # Imported here: --no-ingest builds skip the feed/AI and numpy stacks.
+    from app.ingest import ingest_once
+    from app.related import refresh_after_ingest
+
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     init_db()
 
     # Pull fresh items
     result = ingest_once(limit_per_source=int(os.getenv("LIMIT_PER_SOURCE", "40")))
-    print(f"Ingest complete: inserted={result['inserted']} skipped={result['skipped']} sources={result['sources']}")
-
-    # Load recent items
-    with get_session() as session:
-        items = session.exec(
-            select(Item).order_by(Item.fetched_at.desc()).limit(int(os.getenv("MAX_ITEMS", "500")))
-        ).all()
+    print(
+        f"Ingest complete: inserted={result['inserted']} updated={result['updated']} skipped={result['skipped']} "
+        f"busy={result['busy']} sources={result['sources']}"
+    )
+    for name, st in result["per_source"].items():
+        print(
+            f"  {name}: {st['wire_bytes']} bytes received, {st['entries']} entries, "
+            f"{st['processed']} considered, {st.get('enriched', 0)} tagged/summarized"
+        )
+    related = refresh_after_ingest(result)
+    if related is not None:
+        print(f"Related refresh: items={related['items']} recomputed={related['recomputed']}")
 
-    # Exclude journals from the public site entirely
-    items_public = [it for it in items if (it.item_type or "").lower() != "journal"]
-    items_dict = [_item_to_dict(it) for it in items_public]
 
-    # Build RSS (newsletter) from non-journal items
-    rss_items = items_public[: int(os.getenv("NEWSLETTER_ITEMS", "60"))]
-    rss = build_rss(
-        title=f"{settings.site_name} – Weekly Digest",
-        link=settings.public_base_url.rstrip("/"),
-        description="Research funding, CFPs, and conferences in management & international business.",
-        items=rss_items,
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate the static site into docs/.")
+    ap.add_argument(
+        "--no-ingest",
+        action="store_true",
+        help="only rebuild the site from the existing DB (safe while the worker is ingesting)",
     )
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    if args.no_ingest:
+        db_path = Path(settings.db_path)
+        if not db_path.is_file():
+            raise SystemExit(f"No database at {db_path}; run without --no-ingest once to create it.")
+        # Idempotent; migrates a DB from an older version and switches it to WAL.
+        init_db()
+    else:
+        _ingest()
 
-    # Write docs
-    (DOCS_DIR / "assets").mkdir(parents=True, exist_ok=True)
-    (DOCS_DIR / "feeds").mkdir(parents=True, exist_ok=True)
+    # Load recent items (one consistent snapshot, even if the worker is writing)
+    with read_snapshot() as conn:
+        items = fetch_item_rows(
+            select(*ITEM_ROW_COLUMNS).order_by(Item.fetched_at.desc()).limit(int(os.getenv("MAX_ITEMS", "500"))),
+            conn,
+        )
+        # Exclude journals from the public site entirely
+        items_public = [it for it in items if (it.item_type or "").lower() != "journal"]
+        related = fetch_related((it.id for it in items_public), conn=conn)
 
-    (DOCS_DIR / "assets" / "items.json").write_text(
-        json.dumps(items_dict, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
-    (DOCS_DIR / "feeds" / "newsletter.xml").write_text(rss, encoding="utf-8")
-    (DOCS_DIR / "index.html").write_text(_render_index(items_dict), encoding="utf-8")
+    items_dict = [_item_to_dict(it, related.get(it.id, [])) for it in items_public]
+
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    files = [
+        ("assets/items.json", json.dumps(items_dict, ensure_ascii=False, indent=2)),
+        *_feeds(items_public),
+        *_listing_pages(items_dict, generated_at),
+    ]
+
+    # Page counts shrink with the data; drop pages from earlier builds.
+    shutil.rmtree(DOCS_DIR / "browse", ignore_errors=True)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_write_doc, files))
+    print(f"Wrote {len(files)} files")
 
     _write_public_config()
 
@@ -368,7 +697,7 @@ def main() -> None:
     (DOCS_DIR / ".nojekyll").write_text("", encoding="utf-8")
     (DOCS_DIR / "CNAME").write_text(settings.domain_name.strip(), encoding="utf-8")
 
-    print(f"Static site written to: {DOCS_DIR}")
+    print(f"Static site written to: {DOCS_DIR} in {time.perf_counter() - t0:.2f}s")
     print('Next: commit/push the "docs/" folder (GitHub Desktop is fine).')
 
 
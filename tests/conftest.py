@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# app.config reads the environment at import time: point it at a throwaway DB
+# before any test imports app.*.
+_tmp = tempfile.mkdtemp(prefix="mss-test-")
+os.environ["DB_PATH"] = str(Path(_tmp) / "mss.sqlite")
+os.environ["OPENAI_API_KEY"] = ""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
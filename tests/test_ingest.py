@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import gzip
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+from sqlalchemy import select
+
+import app.ingest as ingest
+from app.config import settings
+from app.db import engine
+from app.models import Item
+
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>
+<item><title>Shared opportunity</title><link>https://example.org/shared</link>
+<description>{summary}</description><pubDate>Mon, 01 Sep 2026 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def test_link_listed_by_two_sources_is_not_re_enriched(tmp_path, monkeypatch):
+    # Two sources list the same link with different text (Grants.gov's "New"
+    # and "Modified" feeds); neither may keep overwriting the other's row.
+    new = tmp_path / "new.xml"
+    modified = tmp_path / "modified.xml"
+    new.write_text(FEED.format(name="New", summary="Posted"), encoding="utf-8")
+    modified.write_text(FEED.format(name="Modified", summary="Deadline extended"), encoding="utf-8")
+    monkeypatch.setattr(
+        ingest, "load_sources", lambda: [{"name": "New", "url": str(new)}, {"name": "Modified", "url": str(modified)}]
+    )
+    calls = []
+    enrich = ingest.enrich_entry
+    monkeypatch.setattr(ingest, "enrich_entry", lambda *a: (calls.append(a[0]), enrich(*a))[1])
+
+    first = ingest.ingest_once()
+    assert (first["inserted"], first["updated"]) == (1, 0)
+    for _ in range(2):
+        again = ingest.ingest_once()
+        assert (again["inserted"], again["updated"], again["skipped"]) == (0, 0, 2)
+    assert len(calls) == 1
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(Item.source, Item.updated_at, Item.fetched_at)).all()
+    assert [(r.source, r.updated_at == r.fetched_at) for r in rows] == [("New", True)]
+
+
+def test_concurrent_ingesters_inserting_the_same_link(tmp_path, monkeypatch):
+    # Two ingesters (worker threads, or the worker and /admin/ingest) each
+    # take one of two sources listing the same new link at the same time.
+    a = tmp_path / "a.xml"
+    b = tmp_path / "b.xml"
+    a.write_text(FEED.format(name="A", summary="Posted").replace("shared", "race"), encoding="utf-8")
+    b.write_text(FEED.format(name="B", summary="Changed").replace("shared", "race"), encoding="utf-8")
+    monkeypatch.setattr(ingest, "load_sources", lambda: [{"name": "A", "url": str(a)}, {"name": "B", "url": str(b)}])
+    enrich = ingest.enrich_entry
+    # Both lookups happen before either insert.
+    monkeypatch.setattr(ingest, "enrich_entry", lambda *args: (time.sleep(0.5), enrich(*args))[1])
+
+    done: set[str] = set()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: ingest.ingest_once(done=done), range(2)))
+
+    assert sum(r["inserted"] for r in results) == 1
+    assert sum(r["skipped"] for r in results) == 1
+    assert sum(len(r["per_source"]) for r in results) == 2
+    with engine.connect() as conn:
+        rows = conn.execute(select(Item.source).where(Item.url == "https://example.org/race")).all()
+    assert len(rows) == 1
+
+def test_finished_sources_are_not_held_for_later_calls(tmp_path, monkeypatch):
+    feed = tmp_path / "feed.xml"
+    feed.write_text(FEED.format(name="Solo", summary="Open call").replace("shared", "solo"), encoding="utf-8")
+    monkeypatch.setattr(ingest, "load_sources", lambda: [{"name": "Solo", "url": str(feed)}])
+
+    assert ingest.ingest_once()["inserted"] == 1
+    # e.g. /admin/ingest right after a worker round
+    assert ingest.ingest_once()["busy"] == 0
+
+    # Calls sharing a round's ``done`` set do not repeat a finished source.
+    done: set[str] = set()
+    assert ingest.ingest_once(done=done)["busy"] == 0
+    assert ingest.ingest_once(done=done)["busy"] == 1
+
+
+def test_fetch_feed_reports_bytes_received(tmp_path):
+    items = "".join(
+        f"<item><title>Call {i}</title><link>https://example.org/{i}</link><description>{'x' * 200}</description></item>"
+        for i in range(50)
+    )
+    body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>{items}</channel></rss>'.encode()
+    compressed = gzip.compress(body)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(compressed)))
+            self.end_headers()
+            self.wfile.write(compressed)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/feed.xml"
+        payload, wire = ingest.fetch_feed(url, max_bytes=len(body) * 2)
+        assert (payload, wire) == (body, len(compressed))
+
+        # Capped: the decoded payload ends at a complete entry, and the count
+        # is still what came over the wire, not the cap.
+        payload, wire = ingest.fetch_feed(url, max_bytes=5000)
+        assert len(payload) <= 5000 and payload.endswith(b"</item>")
+        assert 0 < wire <= len(compressed)
+    finally:
+        server.shutdown()
+
+    local = tmp_path / "feed.xml"
+    local.write_bytes(body)
+    assert ingest.fetch_feed(str(local), max_bytes=5000)[1] == 5001
+
+
+def test_unreadable_local_source_does_not_stop_the_others(tmp_path, monkeypatch):
+    feed = tmp_path / "feed.xml"
+    feed.write_text(FEED.format(name="Ok", summary="Open call").replace("shared", "after-missing"), encoding="utf-8")
+    monkeypatch.setattr(
+        ingest,
+        "load_sources",
+        lambda: [{"name": "Gone", "url": str(tmp_path / "missing.xml")}, {"name": "Ok", "url": str(feed)}],
+    )
+
+    assert ingest.fetch_feed(str(tmp_path / "missing.xml")) is None
+    assert ingest.ingest_once()["inserted"] == 1
+
+
+def test_payload_archived_only_when_a_row_references_it(tmp_path, monkeypatch):
+    feed = tmp_path / "feed.xml"
+    monkeypatch.setattr(ingest, "load_sources", lambda: [{"name": "Stamped", "url": str(feed)}])
+
+    def write(build_date: str) -> None:
+        body = FEED.format(name="Stamped", summary="Open call").replace("shared", "stamped")
+        feed.write_text(body.replace("<channel>", f"<channel><lastBuildDate>{build_date}</lastBuildDate>"), encoding="utf-8")
+
+    def archived() -> set:
+        return {p.name for p in settings.archive_path.rglob("*.xml.gz")}
+
+    write("Mon, 01 Sep 2026 10:00:00 GMT")
+    before = archived()
+    assert ingest.ingest_once()["inserted"] == 1
+    with engine.connect() as conn:
+        digest = conn.execute(select(Item.raw_digest).where(Item.url == "https://example.org/stamped")).scalar_one()
+    assert archived() - before == {f"{digest}.xml.gz"}
+
+    # Only the build date changed: nothing to store a row for, nothing archived.
+    write("Mon, 01 Sep 2026 16:00:00 GMT")
+    assert ingest.ingest_once()["skipped"] == 1
+    assert archived() - before == {f"{digest}.xml.gz"}
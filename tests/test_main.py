@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.db import engine, init_db
+from app.main import app
+from app.models import Item
+from app.search import search_key
+
+
+def test_query_without_words_matches_nothing():
+    init_db()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            Item.__table__.insert(),
+            {
+                "title": "Punctuation probe", "url": "https://example.org/punct", "source": "S",
+                "fetched_at": now, "updated_at": now, "fingerprint": "punct-probe",
+                "search_key": search_key("Punctuation probe"),
+            },
+        )
+    client = TestClient(app)
+
+    assert "Punctuation probe" in client.get("/", params={"q": "probe"}).text
+    assert "Punctuation probe" in client.get("/", params={"q": " "}).text
+    for q in ("??", "-"):
+        assert "Punctuation probe" not in client.get("/", params={"q": q}).text
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import func, select
+
+import app.ingest as ingest
+import app.related as related
+import app.worker as worker
+from app.db import engine
+from app.lease import LeaseKeeper
+from app.main import admin_ingest
+from app.models import Item, RelatedItem
+
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>
+<item><title>{name} doctoral fellowship in strategy</title><link>https://example.org/{name}/1</link>
+<description>Fellowship for doctoral researchers in strategy</description></item>
+</channel></rss>"""
+
+
+def _sources(tmp_path, monkeypatch, names):
+    sources = []
+    for name in names:
+        path = tmp_path / f"{name}.xml"
+        path.write_text(FEED.format(name=name), encoding="utf-8")
+        sources.append({"name": name, "url": str(path)})
+    monkeypatch.setattr(ingest, "load_sources", lambda: sources)
+
+
+def _without_lists() -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(Item).where(~Item.id.in_(select(RelatedItem.item_id)))
+        ).scalar_one()
+
+
+def test_admin_ingest_refreshes_related_lists(tmp_path, monkeypatch):
+    _sources(tmp_path, monkeypatch, ("alpha", "beta"))
+
+    result = admin_ingest()
+    assert result["inserted"] == 2
+    assert result["related"] is not None
+    assert _without_lists() == 0
+
+
+def test_refresh_waits_for_a_running_one(tmp_path, monkeypatch):
+    _sources(tmp_path, monkeypatch, ("gamma", "delta"))
+    monkeypatch.setattr(related, "LEASE_POLL", 0.05)
+    with LeaseKeeper() as other:
+        assert other.acquire("related")
+        threading.Timer(0.3, other.release, args=("related",)).start()
+        result = admin_ingest()
+    assert result["related"] is not None
+    assert _without_lists() == 0
+
+
+def test_worker_round_picks_up_skipped_refresh(tmp_path, monkeypatch):
+    _sources(tmp_path, monkeypatch, ("epsilon", "zeta"))
+    monkeypatch.setattr(worker, "LEASE_WAIT", 0)
+    with LeaseKeeper() as other:
+        assert other.acquire("related")
+        worker.ingest_round()
+        assert _without_lists() == 2
+    # Nothing new this round, but the items left stale above get their lists.
+    worker.ingest_round()
+    assert _without_lists() == 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import subprocess
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app import search
+from app.db import engine, init_db
+from app.models import Item
+from app.search import fold, match_expression, stem, tokens
+
+WORDS = [
+    "Förderung", "foerderung", "Förderungen", "Straße", "Crème brûlée", "Research Fellowships",
+    "studies funded conferences", "Ausschreibungen business classes", "Management", "uses", "ÄÖÜ äöü",
+]
+
+
+def _matches(conn, q: str) -> set[str]:
+    expr = match_expression(conn, q)
+    rows = conn.execute(
+        text("SELECT item.url FROM item JOIN item_fts ON item_fts.rowid = item.id WHERE item_fts MATCH :q"),
+        {"q": expr},
+    )
+    return {r[0] for r in rows}
+
+
+@pytest.fixture(scope="module")
+def conn():
+    init_db()
+    now = datetime.utcnow()
+    rows = [
+        ("Förderung für Nachwuchsforschende", "https://example.org/foerderung"),
+        ("Strategic management fellowship", "https://example.org/management"),
+    ]
+    with engine.begin() as c:
+        for title, url in rows:
+            c.execute(
+                Item.__table__.insert(),
+                {
+                    "title": title, "url": url, "source": "Search test", "fetched_at": now, "updated_at": now,
+                    "fingerprint": url, "search_key": search.search_key(title),
+                },
+            )
+        search.index_terms(c, [search.search_key(t) for t, _ in rows])
+    with engine.connect() as c:
+        yield c
+
+
+def test_fold():
+    assert fold("Straße") == "strasse"
+    assert fold("Förderung") == "foerderung"
+    assert fold("Crème") == "creme"
+
+
+def test_stem_keeps_at_least_four_characters():
+    for word in ("uses", "rates", "ideas", "eses", "sing", "ending", "series", "fees"):
+        assert len(stem(word)) >= 4
+    assert stem("uses") == "uses"
+    assert stem("fellowships") == "fellowship"
+
+
+def test_umlaut_spellings_and_typos_reach_the_same_row(conn):
+    assert tokens("förderung") == tokens("foerderung") == ["foerderung"]
+    for q in ("foerderung", "förderung", "fördrung", "Förderungen"):
+        assert "https://example.org/foerderung" in _matches(conn, q), q
+    assert "https://example.org/management" in _matches(conn, "managment")
+
+
+def test_install_backfills_rows_without_a_search_key(conn):
+    now = datetime.utcnow()
+    with engine.begin() as c:
+        c.execute(
+            Item.__table__.insert(),
+            {
+                "title": "Legacy Ausschreibung", "url": "https://example.org/legacy", "source": "Old",
+                "fetched_at": now, "updated_at": now, "fingerprint": "legacy", "search_key": "",
+            },
+        )
+        search.install(c)
+    key = conn.execute(text("SELECT search_key FROM item WHERE url = 'https://example.org/legacy'")).scalar_one()
+    assert key == search.search_key("Legacy Ausschreibung", "", "General", "Old")
+    assert "https://example.org/legacy" in _matches(conn, "ausschreibungen")
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_js_port_tokenizes_like_python(tmp_path):
+    import generate_site
+
+    page = generate_site._render_page([], "All", "All", 1, 1, "now")
+    script = re.search(r"<script>\n(.*?)</script>", page, re.S).group(1)
+    # Only the pure functions; the rest needs a DOM.
+    script = script[: script.index("function buildIndex")]
+    probe = tmp_path / "probe.js"
+    probe.write_text(
+        script + f"\nconsole.log(JSON.stringify({json.dumps(WORDS)}.map(w => tokens(w))));\n", encoding="utf-8"
+    )
+    out = subprocess.run(["node", str(probe)], capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == [tokens(w) for w in WORDS]